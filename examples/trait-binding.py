@@ -0,0 +1,40 @@
+from functools import partial
+from timeit import repeat
+
+from pytsp import TravellingSalesman
+
+euclidean = TravellingSalesman.Traits.Metric.euclidean
+
+
+class Legacy(object):
+    # Trait dispatch as it used to be: a property building a partial per access
+    metric = property(lambda self: partial(getattr(self, '_metric'), self))
+
+    def __init__(self):
+        self._metric = euclidean
+
+
+def best(statement, number, **namespace):
+    return min(repeat(statement, globals=namespace, number=number, repeat=5)) / number
+
+
+if __name__ == '__main__':
+    a, b = (1.0, 2.0), (3.0, 4.0)
+
+    tsp, legacy = TravellingSalesman(metric='euclidean'), Legacy()
+
+    calls = {
+        'function': best('f(None, a, b)', 10 ** 6, f=euclidean, a=a, b=b),
+        'partial property': best('m.metric(a, b)', 10 ** 6, m=legacy, a=a, b=b),
+        'bound trait': best('m.metric(a, b)', 10 ** 6, m=tsp, a=a, b=b),
+    }
+
+    for name, seconds in calls.items():
+        print(f'{name:<20}{seconds * 1e9:>10.1f} ns/call')
+
+    seconds = best(
+        'TravellingSalesman(metric="euclidean", mutate="shift_1")', 10 ** 4,
+        TravellingSalesman=TravellingSalesman
+    )
+
+    print(f'{"instantiation":<20}{seconds * 1e6:>10.1f} us/instance')
@@ -32,15 +32,25 @@ __status__ = 'Development'
 __all__ = [
     'AnnealingMixin',
     'CompressedAnnealing',
+    'DistanceMatrix',
     'SimulatedAnnealing',
     'GeneticAlgorithm',
+    'Listener',
     'Model',
     'cached',
     'jarvis',
+    'minkowski',
+    'monotone_chain',
+    'proposes',
+    'symmetric',
+    'unordered',
+    'vectorized',
     'TravellingSalesman',
     'TravellingSalesmanTimeWindows'
 ]
 
-from pytsp.core import (AnnealingMixin, CompressedAnnealing, GeneticAlgorithm,
-                        Model, SimulatedAnnealing, TravellingSalesman,
-                        TravellingSalesmanTimeWindows, cached, jarvis)
+from pytsp.core import (AnnealingMixin, CompressedAnnealing, DistanceMatrix,
+                        GeneticAlgorithm, Listener, Model, SimulatedAnnealing,
+                        TravellingSalesman, TravellingSalesmanTimeWindows,
+                        cached, jarvis, minkowski, monotone_chain, proposes,
+                        symmetric, unordered, vectorized)
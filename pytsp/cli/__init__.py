@@ -1,3 +1,4 @@
 
 from pytsp.cli.decorators import plot, safe
-from pytsp.cli.options import Dictionary, Timewindow, Method
+from pytsp.cli.lookup import Lookup
+from pytsp.cli.options import Dictionary, Interval, Timewindow, Method
@@ -6,20 +6,32 @@ def plot(method):
     from matplotlib import pyplot as plt
     from pathlib import Path
     from math import modf
+    from time import perf_counter
+    from click import echo
 
     @wraps(method)
     def wrapper(ctx, **kwargs):
         tsp = ctx.obj['class'](**{
             'metric': ctx.obj['metric'],
+            'matrix': ctx.obj['matrix'],
+            'stride': ctx.obj['stride'],
+            'profile': ctx.obj['profile'],
+            'time_limit': ctx.obj['time_limit'],
             'service': ctx.obj.get('service', None),
             'timewindow': ctx.obj.get('timewindow', None),
             **kwargs
         })
 
+        start = perf_counter()
+
         route, cost = getattr(tsp, method.__name__)(
             ctx.obj['depot'], ctx.obj['cities']
         )
 
+        if ctx.obj['profile'] is True:
+            echo(f'{method.__name__.replace("_", " ").title()}\n')
+            echo(tsp.report(perf_counter() - start) + '\n')
+
         figure = plt.figure()
 
         plt.title(
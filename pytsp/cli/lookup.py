@@ -0,0 +1,14 @@
+
+class Lookup(object):
+    def __init__(self):
+        self.cache = {}
+
+    @staticmethod
+    def key(city):
+        return round(city[0], 1), round(city[1], 1)
+
+    def __setitem__(self, city, value):
+        self.cache[self.key(city)] = value
+
+    def __call__(self, model, city):
+        return self.cache[self.key(city)]
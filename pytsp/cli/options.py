@@ -1,5 +1,5 @@
 
-from click import Choice, Tuple
+from click import Choice, FloatRange, Tuple
 from inspect import getmembers, isfunction
 
 
@@ -44,6 +44,26 @@ class Timewindow(Tuple):
         return hours * 3600 + minutes * 60
 
 
+class Interval(FloatRange):
+    name = 'interval'
+
+    def __init__(self, min=None, max=None, min_open=False, max_open=False):
+        super().__init__(min, max)
+
+        self.min_open, self.max_open = min_open, max_open
+
+    def convert(self, value, param, ctx):
+        value = super().convert(value, param, ctx)
+
+        if self.min_open and value == self.min:
+            self.fail(f"{value} should be greater than {self.min}", param, ctx)
+
+        if self.max_open and value == self.max:
+            self.fail(f"{value} should be less than {self.max}", param, ctx)
+
+        return value
+
+
 class Method(Choice):
     name = 'method'
 
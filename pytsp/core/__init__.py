@@ -2,5 +2,9 @@
 from pytsp.core.annealing import (AnnealingMixin, CompressedAnnealing,
                             SimulatedAnnealing)
 from pytsp.core.genetic import GeneticAlgorithm
-from pytsp.core.util import Model, cached, jarvis
+from pytsp.core.util import (DistanceFunction, DistanceMatrix, KDTree, Listener,
+                             LogListener, Model, Reverse, Shift, Swap, Tour,
+                             cached, jarvis, minkowski, monotone_chain,
+                             nearest, proposes, symmetric, unordered,
+                             vectorized)
 from pytsp.core.tsp import TravellingSalesman, TravellingSalesmanTimeWindows
@@ -1,9 +1,13 @@
 
+from itertools import repeat
 from logging import getLogger
-from math import exp, log
-from random import random
+from math import ceil, exp, log, sqrt
+from random import getstate, random, randrange, seed, setstate
 
-from pytsp.core.util import Model
+import numpy as np
+
+from pytsp.core.util import Budget, Cache, Model, parallel
+from pytsp.core.util.decorators import freeze
 
 
 class AnnealingMixin(Model):
@@ -23,7 +27,36 @@ class AnnealingMixin(Model):
 
 class SimulatedAnnealing(AnnealingMixin):
     class Traits(AnnealingMixin.Traits):
-        pass
+        class Schedule:
+            def geometric(self, temperature, statistics):
+                return temperature * (1 - self.COOLING_RATE) ** statistics['proposed']
+
+            def lundy_mees(self, temperature, statistics):
+                beta = (1 / self.MIN_TEMPERATURE - 1 / self.MAX_TEMPERATURE) / \
+                    self.MAX_ITERATIONS
+
+                return 1 / (1 / temperature + beta * statistics['proposed'])
+
+            def adaptive(self, temperature, statistics):
+                ratio = statistics['accepted'] / statistics['proposed']
+
+                rate = self.COOLING_RATE * min(
+                    10, max(0.1, ratio / self.TARGET_ACCEPTANCE)
+                )
+
+                return temperature * (1 - min(rate, 0.5)) ** statistics['proposed']
+
+            def reheating(self, temperature, statistics):
+                ratio = statistics['accepted'] / statistics['proposed']
+
+                if statistics['idle'] >= self.STAGNATION and \
+                        ratio < self.FROZEN_ACCEPTANCE:
+                    return max(temperature, min(
+                        statistics['best_temperature'],
+                        temperature * self.REHEAT_FACTOR
+                    ))
+
+                return temperature * (1 - self.COOLING_RATE) ** statistics['proposed']
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -32,30 +65,69 @@ class SimulatedAnnealing(AnnealingMixin):
         self.COOLING_RATE = kwargs.get('cooling_rate', 0.000625)
         self.MAX_ITERATIONS = kwargs.get('max_iterations', 10000)
 
+        self.REPLICAS = kwargs.get('replicas', 1)
+        self.MIN_TEMPERATURE = kwargs.get('min_temperature', 1)
+        self.EXCHANGE_INTERVAL = kwargs.get('exchange_interval', 100)
+        self.WORKERS = kwargs.get('workers', None)
+
+        self.ITERATIONS_PER_TEMPERATURE = kwargs.get(
+            'iterations_per_temperature',
+            100
+        )
+        self.ACCEPTANCES_PER_TEMPERATURE = kwargs.get(
+            'acceptances_per_temperature',
+            max(1, self.ITERATIONS_PER_TEMPERATURE // 10)
+        )
+        self.TARGET_ACCEPTANCE = kwargs.get('target_acceptance', 0.3)
+        self.STAGNATION = kwargs.get('stagnation', 20)
+        self.FROZEN_ACCEPTANCE = kwargs.get('frozen_acceptance', 0.03)
+        self.REHEAT_FACTOR = kwargs.get('reheat_factor', 2)
+
+        self.RELATIVE_TOLERANCE = kwargs.get('relative_tolerance', 1e-9)
+
+        self.statistics = None
+
         self.logger = getLogger(self.__class__.__name__)
 
-    def fit(self, initial):
+    def improves(self, candidate_cost, best_cost):
+        return candidate_cost < best_cost - self.RELATIVE_TOLERANCE * abs(best_cost)
+
+    def fit(self, initial, budget=None):
+        if budget is None:
+            budget = self.budget()
+
+        if self.REPLICAS > 1:
+            return self.temper(initial, budget)
+
+        if hasattr(self, 'schedule'):
+            return self.anneal(initial, budget)
+
+        move = self.annotation('mutate', 'move')
+        if move is not None and hasattr(self, 'delta'):
+            return self._fit(initial, move, budget)
+
         current, best = initial, initial
         current_cost = best_cost = self.cost(current)
 
+        observers = self.observers()
+
         temperature, iteration = self.MAX_TEMPERATURE, 0
-        while iteration < self.MAX_ITERATIONS and temperature > 1:
-            self.logger.info(
-                'Iteration: %04d, Temperature: %09.3f' % (
-                    iteration,
-                    temperature
-                )
-            )
-            self.logger.info(
-                'Best: %s, Cost: %07.2f' % (
-                    best,
-                    best_cost
+        while iteration < self.MAX_ITERATIONS and temperature > 1 and \
+                not budget.exhausted():
+            if observers and iteration % self.STRIDE == 0:
+                self.notify(
+                    observers, 'on_iteration',
+                    iteration=iteration,
+                    temperature=temperature,
+                    cost=current_cost,
+                    best_cost=best_cost
                 )
-            )
 
             candidate = self.mutate(current)
             candidate_cost = self.cost(candidate)
 
+            budget.spend()
+
             if self.acceptance_probability(current_cost, candidate_cost, temperature) > random():
                 current, current_cost = candidate, candidate_cost
 
@@ -63,23 +135,329 @@ class SimulatedAnnealing(AnnealingMixin):
                 best, best_cost = current, current_cost
                 temperature, iteration = self.MAX_TEMPERATURE, 0
 
+                if observers:
+                    self.notify(
+                        observers, 'on_improvement', best=best, cost=best_cost
+                    )
+
             iteration += 1
             temperature *= (1 - self.COOLING_RATE)
 
         return best, best_cost
 
+    def _fit(self, initial, move, budget):
+        current, best = initial[:], initial[:]
+        current_cost = best_cost = self.cost(current)
+
+        observers = self.observers()
+
+        temperature, iteration = self.MAX_TEMPERATURE, 0
+        while iteration < self.MAX_ITERATIONS and temperature > 1 and \
+                not budget.exhausted():
+            if observers and iteration % self.STRIDE == 0:
+                self.notify(
+                    observers, 'on_iteration',
+                    iteration=iteration,
+                    temperature=temperature,
+                    cost=current_cost,
+                    best_cost=best_cost
+                )
+
+            candidate = move.random(current)
+            candidate_cost = current_cost + self.delta(current, candidate)
+
+            budget.spend()
+
+            if self.acceptance_probability(current_cost, candidate_cost, temperature) > random():
+                current, current_cost = candidate.apply(current), candidate_cost
+
+            # Accumulated deltas drift from the actual cost, which is hence
+            # recomputed before any improvement is recorded
+            if self.improves(current_cost, best_cost):
+                current_cost = self.cost(current)
+
+            if self.improves(current_cost, best_cost):
+                best, best_cost = current[:], current_cost
+                temperature, iteration = self.MAX_TEMPERATURE, 0
+
+                if observers:
+                    self.notify(
+                        observers, 'on_improvement', best=best, cost=best_cost
+                    )
+
+            iteration += 1
+            temperature *= (1 - self.COOLING_RATE)
+
+        return best, self.cost(best)
+
+    def anneal(self, initial, budget):
+        move = self.annotation('mutate', 'move')
+        if move is None or not hasattr(self, 'delta'):
+            move = None
+
+        current = initial[:]
+        current_cost = self.cost(current)
+
+        best, best_cost = current[:], current_cost
+
+        observers = self.observers()
+
+        temperature, best_temperature = self.MAX_TEMPERATURE, self.MAX_TEMPERATURE
+        step, iteration, idle = 0, 0, 0
+        while iteration < self.MAX_ITERATIONS and \
+                temperature > self.MIN_TEMPERATURE and not budget.exhausted():
+            if observers and step % self.STRIDE == 0:
+                self.notify(
+                    observers, 'on_temperature_change',
+                    step=step,
+                    iteration=iteration,
+                    temperature=temperature,
+                    cost=current_cost,
+                    best_cost=best_cost
+                )
+
+            # Equilibrium is assumed after a fixed number of proposals, or
+            # sooner at high temperatures, after a fixed number of acceptances,
+            # but at least one move is proposed at every temperature
+            proposed, accepted, improved = 0, 0, False
+            while proposed == 0 or (
+                proposed < self.ITERATIONS_PER_TEMPERATURE and
+                accepted < self.ACCEPTANCES_PER_TEMPERATURE and
+                iteration < self.MAX_ITERATIONS and not budget.exhausted()
+            ):
+                if move is not None:
+                    candidate = move.random(current)
+                    candidate_cost = current_cost + self.delta(current, candidate)
+                else:
+                    candidate = self.mutate(current)
+                    candidate_cost = self.cost(candidate)
+
+                budget.spend()
+
+                proposed += 1
+                iteration += 1
+
+                if self.acceptance_probability(current_cost, candidate_cost, temperature) > random():
+                    if move is not None:
+                        candidate = candidate.apply(current)
+
+                    current, current_cost = candidate, candidate_cost
+
+                    accepted += 1
+
+                    if move is not None and self.improves(current_cost, best_cost):
+                        current_cost = self.cost(current)
+
+                    if self.improves(current_cost, best_cost):
+                        best, best_cost = current[:], current_cost
+                        best_temperature, improved = temperature, True
+
+                        if observers:
+                            self.notify(
+                                observers, 'on_improvement',
+                                best=best, cost=best_cost
+                            )
+
+            idle = 0 if improved else idle + 1
+
+            following = self.schedule(temperature, {
+                'step': step,
+                'iteration': iteration,
+                'proposed': max(1, proposed),
+                'accepted': accepted,
+                'idle': idle,
+                'best_temperature': best_temperature
+            })
+
+            if following > temperature:
+                idle = 0
+
+            temperature, step = following, step + 1
+
+        return best, self.cost(best)
+
+    def temper(self, initial, budget):
+        ratio = (self.MIN_TEMPERATURE / self.MAX_TEMPERATURE) ** \
+            (1 / (self.REPLICAS - 1))
+
+        temperatures = [
+            self.MAX_TEMPERATURE * ratio ** k for k in range(self.REPLICAS)
+        ]
+
+        base = randrange(2 ** 32)
+
+        epochs = ceil(self.MAX_ITERATIONS / self.EXCHANGE_INTERVAL)
+
+        replicas = [initial[:] for _ in temperatures]
+        costs = [self.cost(initial)] * self.REPLICAS
+
+        self.statistics = [
+            {'temperature': temperature, 'proposed': 0, 'accepted': 0, 'swaps': 0}
+            for temperature in temperatures
+        ]
+
+        observers = self.observers()
+
+        best, best_cost = initial[:], costs[0]
+        with parallel.executor(self, self.WORKERS) as executor:
+            for epoch in range(epochs):
+                if budget.exhausted():
+                    break
+
+                iterations = min(
+                    self.EXCHANGE_INTERVAL,
+                    self.MAX_ITERATIONS - epoch * self.EXCHANGE_INTERVAL
+                )
+
+                results = executor.map(
+                    parallel.dispatch,
+                    repeat('replica'),
+                    [f'{base}:{k}:{epoch}' for k in range(self.REPLICAS)],
+                    replicas,
+                    temperatures,
+                    repeat(iterations),
+                    repeat(budget.expiry())
+                )
+
+                for k, (current, current_cost, _best, _best_cost, proposed, accepted) in \
+                        enumerate(results):
+                    replicas[k], costs[k] = current, current_cost
+
+                    self.statistics[k]['proposed'] += proposed
+                    self.statistics[k]['accepted'] += accepted
+
+                    budget.spend(proposed)
+
+                    if _best_cost < best_cost:
+                        best, best_cost = _best, _best_cost
+
+                        if observers:
+                            self.notify(
+                                observers, 'on_improvement',
+                                best=best, cost=best_cost, replica=k
+                            )
+
+                if observers and epoch % self.STRIDE == 0:
+                    self.notify(
+                        observers, 'on_iteration',
+                        iteration=epoch * self.EXCHANGE_INTERVAL + iterations,
+                        costs=costs,
+                        best_cost=best_cost
+                    )
+
+                for k in range(epoch % 2, self.REPLICAS - 1, 2):
+                    exponent = (1 / temperatures[k] - 1 / temperatures[k + 1]) * \
+                        (costs[k] - costs[k + 1])
+
+                    if exponent >= 0 or exp(exponent) > random():
+                        replicas[k], replicas[k + 1] = replicas[k + 1], replicas[k]
+                        costs[k], costs[k + 1] = costs[k + 1], costs[k]
+
+                        self.statistics[k]['swaps'] += 1
+                        self.statistics[k + 1]['swaps'] += 1
+
+        for statistics in self.statistics:
+            statistics['acceptance_ratio'] = \
+                statistics['accepted'] / max(1, statistics['proposed'])
+
+        return best, self.cost(best)
+
+    def replica(self, current, temperature, iterations, expiry=None):
+        move = self.annotation('mutate', 'move')
+        if move is None or not hasattr(self, 'delta'):
+            move = None
+
+        current = current[:]
+        current_cost = self.cost(current)
+
+        budget = Budget.until(expiry)
+
+        best, best_cost, proposed, accepted = current[:], current_cost, 0, 0
+        while proposed < iterations and not budget.exhausted():
+            proposed += 1
+
+            if move is not None:
+                candidate = move.random(current)
+                candidate_cost = current_cost + self.delta(current, candidate)
+            else:
+                candidate = self.mutate(current)
+                candidate_cost = self.cost(candidate)
+
+            if self.acceptance_probability(current_cost, candidate_cost, temperature) > random():
+                if move is not None:
+                    candidate = candidate.apply(current)
+
+                current, current_cost = candidate, candidate_cost
+
+                accepted += 1
+
+                if move is not None and self.improves(current_cost, best_cost):
+                    current_cost = self.cost(current)
+
+                if self.improves(current_cost, best_cost):
+                    best, best_cost = current[:], current_cost
+
+        return current, current_cost, best, best_cost, proposed, accepted
+
+
+class Neighborhood(object):
+    def __init__(self, model, route):
+        super().__init__()
+
+        self.model, self.route = model, route
+
+        self.cost, self.penalty = model.cost(route), model.penalty(route)
+
+        self.pending = None
+
+    def propose(self):
+        return self.model.mutate(self.route)
+
+    def evaluate(self, candidate):
+        self.pending = (
+            candidate,
+            self.model.cost(candidate),
+            self.model.penalty(candidate)
+        )
+
+        return self.pending[1:]
+
+    def apply(self, candidate):
+        if self.pending is None or self.pending[0] is not candidate:
+            self.evaluate(candidate)
+
+        self.route, self.cost, self.penalty = self.pending
+
+        self.pending = None
+
+        return self.route
+
+    def sample(self, size):
+        samples = [self.evaluate(self.propose()) for _ in range(size)]
+
+        self.pending = None
+
+        return np.asarray(samples, dtype=float).reshape(size, 2).T
+
+    def snapshot(self):
+        return self.route
+
 
 class CompressedAnnealing(AnnealingMixin):
     class Traits(AnnealingMixin.Traits):
         class Penalty:
             pass
 
+    calibrations = Cache(maxsize=32)
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
         self.COOLING_RATE = kwargs.get('cooling_rate', 0.05)
         self.ACCEPTANCE_RATIO = kwargs.get('acceptance_ratio', 0.94)
         self.INITIAL_PRESSURE = kwargs.get('initial_pressure', 0)
+        self.MAX_TEMPERATURE = kwargs.get('max_temperature', 100000)
+        self.MAX_PRESSURE = kwargs.get('max_pressure', self.INITIAL_PRESSURE)
         self.COMPRESSION_RATE = kwargs.get('compression_rate', 0.06)
         self.PRESSURE_CAP_RATIO = kwargs.get('pressure_cap_ratio', 0.9999)
         self.ITERATIONS_PER_TEMPERATURE = kwargs.get(
@@ -96,134 +474,305 @@ class CompressedAnnealing(AnnealingMixin):
         )
         self.TRIAL_ITERATIONS = kwargs.get('trial_iterations', 30000)
         self.TRIAL_NEIGHBOR_PAIRS = kwargs.get('trial_neighbor_pairs', 5000)
+        self.CALIBRATION_TOLERANCE = kwargs.get('calibration_tolerance', 0.1)
+        self.BATCH_SIZE = kwargs.get('batch_size', 256)
 
         self.logger = getLogger(self.__class__.__name__)
 
-    def calibrate(self, initial):
-        dv, self.MAX_PRESSURE = 0, 0
-        for r in range(0, 2 * self.TRIAL_NEIGHBOR_PAIRS):
-            self.logger.info(
-                'Maximum Pressure: %09.3f' % (
-                    self.MAX_PRESSURE,
+    def neighborhood(self, route):
+        return Neighborhood(self, route)
+
+    def fingerprint(self, initial):
+        return freeze(initial), tuple(
+            vars(self).get(trait.field) for trait in self._traits.values()
+        )
+
+    def calibrate(self, initial, budget=None):
+        if budget is None:
+            budget = self.budget()
+
+        key = (
+            self.fingerprint(initial),
+            self.TRIAL_NEIGHBOR_PAIRS,
+            self.TRIAL_ITERATIONS,
+            self.ACCEPTANCE_RATIO,
+            self.INITIAL_PRESSURE,
+            self.PRESSURE_CAP_RATIO,
+            self.CALIBRATION_TOLERANCE
+        )
+
+        if key in self.calibrations:
+            self.MAX_TEMPERATURE, self.MAX_PRESSURE = self.calibrations.get(key)
+
+            return
+
+        # Calibration draws from a generator seeded by the instance and the
+        # parameters alone, and then leaves it as it found it, so that the
+        # results do not depend on which run filled the cache
+        state = getstate()
+        try:
+            seed(repr((freeze(initial), key[1:])))
+
+            self._calibrate(initial, budget, key)
+        finally:
+            setstate(state)
+
+    def _calibrate(self, initial, budget, key):
+        neighborhood = self.neighborhood(initial)
+
+        observers = self.observers()
+
+        # Neighbors are sampled in bounded batches, so that memory does not
+        # grow with the number of pairs and the budget is checked in between
+        costs, penalties = [], []
+
+        remaining = 2 * self.TRIAL_NEIGHBOR_PAIRS
+        while remaining > 0:
+            if budget.exhausted():
+                self.logger.warning(
+                    'Ran out of budget while sampling neighbors; '
+                    'keeping the current temperature and pressure'
                 )
-            )
 
-            n1, n2 = self.mutate(initial), self.mutate(initial)
+                return
 
-            c1, p1 = self.cost(n1), self.penalty(n1)
-            c2, p2 = self.cost(n2), self.penalty(n2)
+            batch_costs, batch_penalties = neighborhood.sample(
+                min(remaining, self.BATCH_SIZE)
+            )
+
+            costs.append(batch_costs)
+            penalties.append(batch_penalties)
 
-            e1 = c1 + self.INITIAL_PRESSURE * p1
-            e2 = c2 + self.INITIAL_PRESSURE * p2
+            budget.spend(len(batch_costs))
+            remaining -= len(batch_costs)
 
-            dv += abs(e2 - e1)
+        costs, penalties = np.concatenate(costs), np.concatenate(penalties)
 
-            p1 = (c1 / p1) * (
-                self.PRESSURE_CAP_RATIO /
-                (1.0 - self.PRESSURE_CAP_RATIO)
+        feasible = penalties == 0
+        if feasible.any():
+            self.logger.warning(
+                f'{feasible.sum()} out of {len(penalties)} sampled neighbors '
+                f'have no penalty and do not bound the maximum pressure'
             )
-            p2 = (c2 / p2) * (
-                self.PRESSURE_CAP_RATIO /
-                (1.0 - self.PRESSURE_CAP_RATIO)
+
+        if feasible.all():
+            self.MAX_PRESSURE = self.INITIAL_PRESSURE
+        else:
+            self.MAX_PRESSURE = max(self.INITIAL_PRESSURE, np.max(
+                costs[~feasible] / penalties[~feasible]
+            ) * (self.PRESSURE_CAP_RATIO / (1.0 - self.PRESSURE_CAP_RATIO)))
+
+        energy = neighborhood.cost + self.INITIAL_PRESSURE * neighborhood.penalty
+
+        self.MAX_TEMPERATURE = self.estimate(
+            costs + self.INITIAL_PRESSURE * penalties - energy
+        )
+
+        if observers:
+            self.notify(
+                observers, 'on_iteration',
+                iteration=len(costs),
+                max_pressure=self.MAX_PRESSURE,
+                max_temperature=self.MAX_TEMPERATURE
             )
 
-            self.MAX_PRESSURE = max([self.MAX_PRESSURE, p1, p2])
+        # The estimate only accounts for neighbors of the initial route,
+        # hence it is verified by trial walks, bisecting between a failing
+        # and a passing temperature until they are close enough
+        lower, upper, step = None, None, 1 + self.CALIBRATION_TOLERANCE
+        while not budget.exhausted():
+            if observers:
+                self.notify(
+                    observers, 'on_temperature_change',
+                    max_temperature=self.MAX_TEMPERATURE
+                )
+
+            ratio = self.trial(initial, self.MAX_TEMPERATURE, budget)
+
+            if ratio >= self.ACCEPTANCE_RATIO:
+                upper = self.MAX_TEMPERATURE
+            else:
+                lower = self.MAX_TEMPERATURE
+
+            if upper is None:
+                self.MAX_TEMPERATURE, step = lower * step, step * step
+            elif lower is None or upper <= lower * (1 + self.CALIBRATION_TOLERANCE):
+                self.MAX_TEMPERATURE = upper
+
+                self.calibrations.put(key, (self.MAX_TEMPERATURE, self.MAX_PRESSURE))
+
+                break
+            else:
+                self.MAX_TEMPERATURE = sqrt(lower * upper)
+
+    def estimate(self, deltas):
+        uphill = deltas[deltas > 0]
+        if len(uphill) == 0:
+            return 1.0
+
+        def ratio(temperature):
+            return (
+                len(deltas) - len(uphill) + np.exp(-uphill / temperature).sum()
+            ) / len(deltas)
+
+        lower, upper = 0.0, uphill.mean() / log(1 / self.ACCEPTANCE_RATIO)
+        while ratio(upper) < self.ACCEPTANCE_RATIO:
+            lower, upper = upper, 2 * upper
+
+        while upper - lower > 1e-3 * upper:
+            middle = (lower + upper) / 2
+
+            if ratio(middle) < self.ACCEPTANCE_RATIO:
+                lower = middle
+            else:
+                upper = middle
+
+        return upper
+
+    def trial(self, initial, temperature, budget):
+        neighborhood = self.neighborhood(initial)
 
-        self.MAX_TEMPERATURE = dv / log(1 / self.ACCEPTANCE_RATIO)
+        current_cost = neighborhood.cost
+        current_penalty = neighborhood.penalty
 
         accepted = 0
-        while True:
-            self.logger.info(
-                'Maximum Temperature: %013.3f' % (
-                    self.MAX_TEMPERATURE,
-                )
+        for i in range(0, self.TRIAL_ITERATIONS):
+            candidate = neighborhood.propose()
+
+            candidate_cost, candidate_penalty = neighborhood.evaluate(
+                candidate
             )
 
-            accepted = 0
+            current_fit = current_cost + self.INITIAL_PRESSURE * current_penalty
+            candidate_fit = candidate_cost + self.INITIAL_PRESSURE * candidate_penalty
 
-            current = initial
-            current_cost = self.cost(current)
-            current_penalty = self.penalty(current)
+            if self.acceptance_probability(current_fit, candidate_fit, temperature) > random():
+                neighborhood.apply(candidate)
 
-            for i in range(0, self.TRIAL_ITERATIONS):
-                candidate = self.mutate(current)
+                current_cost = candidate_cost
+                current_penalty = candidate_penalty
 
-                candidate_cost = self.cost(candidate)
-                candidate_penalty = self.penalty(candidate)
+                accepted += 1
 
-                current_fit = current_cost + self.INITIAL_PRESSURE * current_penalty
-                candidate_fit = candidate_cost + self.INITIAL_PRESSURE * candidate_penalty
+            budget.spend()
+            if budget.exhausted():
+                break
 
-                if self.acceptance_probability(current_fit, candidate_fit, self.MAX_TEMPERATURE) > random():
-                    current = candidate
-                    current_cost = candidate_cost
-                    current_penalty = candidate_penalty
+        return accepted / self.TRIAL_ITERATIONS
 
-                    accepted += 1
+    def fit(self, initial, budget=None):
+        if budget is None:
+            budget = self.budget()
 
-            if accepted / self.TRIAL_ITERATIONS >= self.ACCEPTANCE_RATIO:
-                break
+        checkpoint = self.checkpoint('compressed_annealing', initial)
 
-            self.MAX_TEMPERATURE *= 1.5
+        state = self.restore(checkpoint, budget)
+        if state is None:
+            self.calibrate(initial, budget)
 
-    def fit(self, initial):
-        if not hasattr(self, 'MAX_TEMPERATURE') or not hasattr(self, 'MAX_PRESSURE'):
-            self.calibrate(initial)
+            neighborhood = self.neighborhood(initial)
 
-        current = best = initial
+            best = neighborhood.snapshot()
 
-        current_cost = best_cost = self.cost(initial)
-        current_penalty = best_penalty = self.penalty(initial)
+            current_cost = best_cost = neighborhood.cost
+            current_penalty = best_penalty = neighborhood.penalty
+
+            pressure, temperature = self.INITIAL_PRESSURE, self.MAX_TEMPERATURE
+            k, idle = -1, -1
+        else:
+            self.MAX_TEMPERATURE = state['max_temperature']
+            self.MAX_PRESSURE = state['max_pressure']
+
+            neighborhood = self.neighborhood(state['route'])
+
+            best = state['best']
+
+            current_cost, best_cost = state['cost'], state['best_cost']
+            current_penalty, best_penalty = state['penalty'], state['best_penalty']
+
+            pressure, temperature = state['pressure'], state['temperature']
+            k, idle = state['step'] - 1, state['idle']
+
+        observers = self.observers()
+
+        while not budget.exhausted():
+            if checkpoint is not None and checkpoint.due(k + 1):
+                checkpoint.save(
+                    k + 1, budget,
+                    max_temperature=self.MAX_TEMPERATURE,
+                    max_pressure=self.MAX_PRESSURE,
+                    route=neighborhood.snapshot(),
+                    best=best,
+                    cost=current_cost,
+                    best_cost=best_cost,
+                    penalty=current_penalty,
+                    best_penalty=best_penalty,
+                    pressure=pressure,
+                    temperature=temperature,
+                    idle=idle
+                )
 
-        pressure, temperature = self.INITIAL_PRESSURE, self.MAX_TEMPERATURE
-        k, idle = -1, -1
-        while True:
             k += 1
             idle += 1
 
-            self.logger.info(
-                'Temperature: %013.3f, Pressure: %09.3f' % (
-                    temperature,
-                    pressure
-                )
-            )
-            self.logger.info(
-                'Best: %s, Cost: %07.2f, Penalty: %07.2f' % (
-                    best,
-                    best_cost,
-                    best_penalty
+            if observers:
+                self.notify(
+                    observers, 'on_temperature_change',
+                    step=k,
+                    temperature=temperature,
+                    pressure=pressure,
+                    best_cost=best_cost,
+                    best_penalty=best_penalty
                 )
-            )
 
             for i in range(0, self.ITERATIONS_PER_TEMPERATURE):
-                candidate = self.mutate(current)
+                if observers and i % self.STRIDE == 0:
+                    self.notify(
+                        observers, 'on_iteration',
+                        iteration=i,
+                        cost=current_cost,
+                        penalty=current_penalty
+                    )
+
+                candidate = neighborhood.propose()
+
+                candidate_cost, candidate_penalty = neighborhood.evaluate(
+                    candidate
+                )
 
-                candidate_cost = self.cost(candidate)
-                candidate_penalty = self.penalty(candidate)
+                budget.spend()
 
                 current_fit = current_cost + pressure * current_penalty
                 candidate_fit = candidate_cost + pressure * candidate_penalty
 
                 if self.acceptance_probability(current_fit, candidate_fit, temperature) > random():
-                    current = candidate
+                    neighborhood.apply(candidate)
+
                     current_cost = candidate_cost
                     current_penalty = candidate_penalty
 
                 if current_penalty <= best_penalty and current_cost < best_cost:
-                    best = current
+                    best = neighborhood.snapshot()
                     best_cost = current_cost
                     best_penalty = current_penalty
 
                     idle = 0
 
+                    if observers:
+                        self.notify(
+                            observers, 'on_improvement',
+                            best=best, cost=best_cost, penalty=best_penalty
+                        )
+
+                if budget.exhausted():
+                    break
+
             if k >= self.MINIMUM_TEMPERATURE_CHANGES and idle >= self.IDLE_TEMPERATURE_CHANGES:
                 break
 
             temperature *= (1 - self.COOLING_RATE)
-            pressure = self.MAX_PRESSURE * (
-                1.0 - (
-                    (self.MAX_PRESSURE - self.INITIAL_PRESSURE) / self.MAX_PRESSURE
-                ) * exp(-1.0 * self.COMPRESSION_RATE * k)
-            )
+            pressure = self.MAX_PRESSURE - (
+                self.MAX_PRESSURE - self.INITIAL_PRESSURE
+            ) * exp(-1.0 * self.COMPRESSION_RATE * k)
 
         return best
@@ -1,8 +1,10 @@
 
+from itertools import repeat
 from logging import getLogger
-from random import random
+from math import ceil
+from random import random, randrange
 
-from pytsp.core.util import Model
+from pytsp.core.util import Budget, Model, parallel
 
 
 class GeneticAlgorithm(Model):
@@ -28,36 +30,91 @@ class GeneticAlgorithm(Model):
         self.POPULATION_SIZE = kwargs.get('population_size', 50)
         self.MAX_ITERATIONS = kwargs.get('max_iterations', 1000)
 
+        self.ISLANDS = kwargs.get('islands', 1)
+        self.MIGRATION_INTERVAL = kwargs.get('migration_interval', 50)
+        self.MIGRATION_SIZE = kwargs.get('migration_size', 2)
+        self.TOPOLOGY = kwargs.get('topology', 'ring')
+        self.WORKERS = kwargs.get('workers', None)
+
         self.logger = getLogger(self.__class__.__name__)
 
-    def fit(self, individual):
+    def fit(self, individual, budget=None):
+        if budget is None:
+            budget = self.budget()
+
+        if self.ISLANDS > 1:
+            return self.archipelago(individual, budget)
+
+        population = self.populate(individual)
+
+        checkpoint = self.checkpoint('genetic_algorithm', individual)
+
+        return self.evolve(
+            population, self.MAX_ITERATIONS, budget, checkpoint
+        )[1]
+
+    def populate(self, individual):
         population = [individual]
         for _ in range(self.POPULATION_SIZE - 1):
             population.append(self.mutate(individual))
 
-        fitest, max_fitness = None, 0
-        for i in range(self.MAX_ITERATIONS):
-            self.logger.info('Iteration: %04d' % (i,))
-            self.logger.info(
-                'Fitest: %s, Fitness: %5.3f' % (
-                    fitest,
-                    max_fitness
+        return population
+
+    def rank(self, population):
+        batch = self.vectorized('fitness')
+
+        if batch is not None:
+            fitness = batch(population).tolist()
+        else:
+            fitness = [self.fitness(individual) for individual in population]
+
+        order = sorted(
+            range(len(population)), key=fitness.__getitem__, reverse=True
+        )
+
+        return [population[i] for i in order], [fitness[i] for i in order]
+
+    def evolve(self, population, generations, budget, checkpoint=None):
+        observers = self.observers()
+
+        fitest, max_fitness, start = None, 0, 0
+
+        state = self.restore(checkpoint, budget)
+        if state is not None:
+            population, start = state['population'], state['step']
+            fitest, max_fitness = state['fitest'], state['max_fitness']
+
+        for i in range(start, generations):
+            if checkpoint is not None and checkpoint.due(i):
+                checkpoint.save(
+                    i, budget,
+                    population=population,
+                    fitest=fitest,
+                    max_fitness=max_fitness
                 )
-            )
 
-            _fitness = {
-                tuple(individual): self.fitness(individual)
-                for individual in population
-            }
+            population, fitness = self.rank(population)
+
+            budget.spend(len(population))
+
+            if observers and i % self.STRIDE == 0:
+                self.notify(
+                    observers, 'on_generation',
+                    generation=i,
+                    fitness=fitness[0],
+                    max_fitness=max(max_fitness, fitness[0])
+                )
 
-            population.sort(key=lambda p: _fitness[tuple(p)], reverse=True)
+            if fitness[0] > max_fitness:
+                fitest, max_fitness = population[0], fitness[0]
 
-            _fitest = population[0]
-            _max_fitness = _fitness[tuple(population[0])]
-            if (_max_fitness > max_fitness):
-                fitest, max_fitness = _fitest, _max_fitness
+                if observers:
+                    self.notify(
+                        observers, 'on_improvement',
+                        best=fitest, fitness=max_fitness
+                    )
 
-            if max_fitness > self.FITNESS_THRESHOLD:
+            if max_fitness > self.FITNESS_THRESHOLD or budget.exhausted():
                 break
 
             successors = []
@@ -74,4 +131,121 @@ class GeneticAlgorithm(Model):
 
             population = successors
 
+        return population, fitest, max_fitness
+
+    def archipelago(self, individual, budget):
+        if self.TOPOLOGY not in ('ring', 'complete'):
+            raise ValueError(f'Unexpected topology {self.TOPOLOGY!r}')
+
+        epochs = ceil(self.MAX_ITERATIONS / self.MIGRATION_INTERVAL)
+
+        checkpoint = self.checkpoint('archipelago', individual)
+
+        state = self.restore(checkpoint, budget)
+        if state is None:
+            base, start = randrange(2 ** 32), 0
+
+            islands = [None] * self.ISLANDS
+
+            fitest, max_fitness = None, 0
+        else:
+            base, start, islands = state['base'], state['step'], state['islands']
+
+            fitest, max_fitness = state['fitest'], state['max_fitness']
+
+        observers = self.observers()
+
+        with parallel.executor(self, self.WORKERS) as executor:
+            for epoch in range(start, epochs):
+                if checkpoint is not None and checkpoint.due(epoch):
+                    checkpoint.save(
+                        epoch, budget,
+                        base=base,
+                        islands=islands,
+                        fitest=fitest,
+                        max_fitness=max_fitness
+                    )
+
+                generations = min(
+                    self.MIGRATION_INTERVAL,
+                    self.MAX_ITERATIONS - epoch * self.MIGRATION_INTERVAL
+                )
+
+                islands = list(executor.map(
+                    parallel.dispatch,
+                    repeat('island'),
+                    [f'{base}:{i}:{epoch}' for i in range(self.ISLANDS)],
+                    repeat(individual),
+                    islands,
+                    repeat(generations),
+                    repeat(budget.expiry())
+                ))
+
+                budget.spend(self.ISLANDS * self.POPULATION_SIZE * generations)
+
+                for i, (_, _, _fitest, _max_fitness) in enumerate(islands):
+                    if _max_fitness > max_fitness:
+                        fitest, max_fitness = _fitest, _max_fitness
+
+                        if observers:
+                            self.notify(
+                                observers, 'on_improvement',
+                                best=fitest, fitness=max_fitness, island=i
+                            )
+
+                if observers and epoch % self.STRIDE == 0:
+                    self.notify(
+                        observers, 'on_generation',
+                        generation=epoch * self.MIGRATION_INTERVAL + generations,
+                        fitness=[_max_fitness for _, _, _, _max_fitness in islands],
+                        max_fitness=max_fitness
+                    )
+
+                if max_fitness > self.FITNESS_THRESHOLD or budget.exhausted():
+                    break
+
+                islands = self.migrate([
+                    (population, fitness) for population, fitness, _, _ in islands
+                ])
+
         return fitest
+
+    def island(self, individual, population, generations, expiry=None):
+        if population is None:
+            population = self.populate(individual)
+
+        population, fitest, max_fitness = self.evolve(
+            population, generations, Budget.until(expiry)
+        )
+
+        population, fitness = self.rank(population)
+
+        return population, fitness, fitest, max_fitness
+
+    def migrate(self, islands):
+        size = min(self.MIGRATION_SIZE, self.POPULATION_SIZE - 1)
+
+        populations = []
+        for i, (population, _) in enumerate(islands):
+            if self.TOPOLOGY == 'ring':
+                sources = [islands[i - 1]]
+            else:
+                sources = islands[:i] + islands[i + 1:]
+
+            migrants = sorted(
+                (
+                    (fitness[k], j, k)
+                    for j, (_, fitness) in enumerate(sources)
+                    for k in range(size)
+                ),
+                reverse=True
+            )[:size]
+
+            population = population[:len(population) - size] + [
+                sources[j][0][k][:] for _, j, k in migrants
+            ]
+
+            populations.append(population)
+
+        return populations
+
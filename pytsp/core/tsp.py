@@ -1,132 +1,386 @@
 
+from collections import deque
+from heapq import heappop, heappush
+from itertools import count
+from math import ceil, sqrt
 from random import random, randrange, shuffle
 
-from pytsp.core import (CompressedAnnealing, GeneticAlgorithm,
-                        SimulatedAnnealing, cached, jarvis)
+import numpy as np
 
+from pytsp.core import (CompressedAnnealing, DistanceFunction, DistanceMatrix,
+                        GeneticAlgorithm, KDTree, Reverse, Shift,
+                        SimulatedAnnealing, Swap, Tour, cached, minkowski,
+                        monotone_chain, nearest, proposes, symmetric,
+                        unordered, vectorized)
+from pytsp.core.util import crossover, mst
+from pytsp.core.util.decorators import freeze
 
-class TravellingSalesman(SimulatedAnnealing, GeneticAlgorithm):
-    class Traits(SimulatedAnnealing.Traits, GeneticAlgorithm.Traits):
-        class Mutate(GeneticAlgorithm.Traits.Mutate):
-            def random_swap(self, elements):
-                neighbor = elements[:]
 
-                i, j = randrange(1, len(elements) -
-                                 1), randrange(1, len(elements) - 1)
-                neighbor[i], neighbor[j] = neighbor[j], neighbor[i]
+def pseudo_euclidean(p1, p2):
+    r = np.sqrt(((p1 - p2) ** 2).sum(axis=-1) / 10.0)
+    t = np.floor(r + 0.5)
 
-                return neighbor
+    return np.where(t < r, t + 1, t)
 
-            def shift_1(self, elements):
-                neighbor = elements[:]
 
-                i, j = randrange(1, len(elements) -
-                                 1), randrange(1, len(elements) - 1)
+def geographical(p1, p2):
+    def radians(x):
+        degrees = np.trunc(x)
 
-                neighbor.insert(j, neighbor.pop(i))
+        return 3.141592 * (degrees + 5.0 * (x - degrees) / 3.0) / 180.0
 
-                return neighbor
+    latitude1, longitude1 = radians(p1[..., 0]), radians(p1[..., 1])
+    latitude2, longitude2 = radians(p2[..., 0]), radians(p2[..., 1])
 
-            def reverse_random_sublist(self, elements):
-                neighbor = elements[:]
+    q1 = np.cos(longitude1 - longitude2)
+    q2 = np.cos(latitude1 - latitude2)
+    q3 = np.cos(latitude1 + latitude2)
 
-                i = randrange(1, len(elements) - 1)
-                j = randrange(1, len(elements) - 1)
+    return np.floor(6378.388 * np.arccos(
+        np.clip(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), -1.0, 1.0)
+    ) + 1.0)
 
-                i, j = min([i, j]), max([i, j])
 
-                neighbor[i:j] = neighbor[i:j][::-1]
+class TravellingSalesman(SimulatedAnnealing, GeneticAlgorithm):
+    class Traits(SimulatedAnnealing.Traits, GeneticAlgorithm.Traits):
+        class Mutate(GeneticAlgorithm.Traits.Mutate):
+            @proposes(Swap)
+            def random_swap(self, elements):
+                return Swap.random(elements).apply(elements[:])
+
+            @proposes(Shift)
+            def shift_1(self, elements):
+                return Shift.random(elements).apply(elements[:])
 
-                return neighbor
+            @proposes(Reverse)
+            def reverse_random_sublist(self, elements):
+                return Reverse.random(elements).apply(elements[:])
 
         class Crossover(GeneticAlgorithm.Traits.Crossover):
             def cut_and_stitch(self, individual_a, individual_b):
                 individual_a, individual_b
 
                 offspring = individual_a[1:len(individual_a) // 2]
+
+                taken = set(offspring)
                 for b in individual_b[1:-1]:
-                    if b not in offspring:
+                    if b not in taken:
+                        taken.add(b)
                         offspring.append(b)
 
                 return [individual_a[0]] + offspring + [individual_b[0]]
 
+            def order(self, individual_a, individual_b):
+                return self.recombine(
+                    crossover.order, individual_a, individual_b
+                )
+
+            def partially_mapped(self, individual_a, individual_b):
+                return self.recombine(
+                    crossover.partially_mapped, individual_a, individual_b
+                )
+
+            def edge_assembly(self, individual_a, individual_b):
+                cities = individual_a[:-1]
+
+                index = {city: i for i, city in enumerate(cities)}
+
+                neighbors = self.candidates(cities)
+
+                distance = self.distance if self.matrix is None else self.matrix.item
+
+                child = crossover.edge_assembly(
+                    list(range(len(cities))),
+                    [index[city] for city in individual_b[:-1]],
+                    lambda i, j: distance(cities[i], cities[j]),
+                    lambda i: [
+                        index[city] for city in neighbors[cities[i]]
+                        if city in index
+                    ]
+                )
+
+                return [cities[i] for i in child] + [cities[0]]
+
         class Select(GeneticAlgorithm.Traits.Select):
             def random_top_half(self, population):
                 return population[randrange(0, len(population) // 2)]
 
         class Fitness(GeneticAlgorithm.Traits.Fitness):
+            @vectorized(lambda self, population: 1.0 / self.costs(population))
             def inverse_cost(self, individual):
                 return 1.0 / self.cost(individual)
 
+            @vectorized(lambda self, population: (
+                (len(population[0]) - 1) ** 2 - (len(population[0]) - 1) + 1
+            ) / self.costs(population))
             def unweighted_mst(self, individual):
                 v = len(individual) - 1
 
                 return ((v * v) - v + 1) / self.cost(individual)
 
+            @vectorized(lambda self, population: np.asarray([
+                self.heuristic(individual) for individual in population
+            ]) / self.costs(population))
             def weighted_mst(self, individual):
                 return self.heuristic(individual) / self.cost(individual)
 
         class Metric:
+            @symmetric
+            @minkowski
+            @vectorized(lambda self, p1, p2: ((p1 - p2) ** 2).sum(axis=-1))
             def euclidean(self, p1, p2):
                 return (p1[0] - p2[0]) ** 2 + (p1[1] - p2[1]) ** 2
 
+            @symmetric
+            @minkowski
+            @vectorized(lambda self, p1, p2: np.abs(p1 - p2).sum(axis=-1))
             def manhattan(self, p1, p2):
                 return abs(p1[0] - p2[0]) + abs(p1[1] - p2[1])
 
+            @symmetric
+            @minkowski
+            @vectorized(lambda self, p1, p2: np.floor(
+                np.sqrt(((p1 - p2) ** 2).sum(axis=-1)) + 0.5
+            ))
+            def euc_2d(self, p1, p2):
+                return int(sqrt((p1[0] - p2[0]) ** 2 + (p1[1] - p2[1]) ** 2) + 0.5)
+
+            @symmetric
+            @minkowski
+            @vectorized(lambda self, p1, p2: np.ceil(
+                np.sqrt(((p1 - p2) ** 2).sum(axis=-1))
+            ))
+            def ceil_2d(self, p1, p2):
+                return ceil(sqrt((p1[0] - p2[0]) ** 2 + (p1[1] - p2[1]) ** 2))
+
+            @symmetric
+            @minkowski
+            @vectorized(lambda self, p1, p2: pseudo_euclidean(p1, p2))
+            def att(self, p1, p2):
+                return int(pseudo_euclidean(np.asarray(p1), np.asarray(p2)))
+
+            @symmetric
+            @vectorized(lambda self, p1, p2: geographical(p1, p2))
+            def geo(self, p1, p2):
+                return int(geographical(np.asarray(p1), np.asarray(p2)))
+
         class Heuristic:
-            @cached
+            @cached(key=unordered)
             def kruskal(self, route):
-                edges = []
-                for u in route[:-1]:
-                    for v in route[:-1]:
-                        if u != v:
-                            edges.append((u, v, self.metric(u, v)))
+                vertices = list(dict.fromkeys(route))
 
-                edges.sort(key=lambda edge: edge[2])
+                if self.MST_NEIGHBORS is not None:
+                    us, vs, ws = self.edges(vertices, self.MST_NEIGHBORS)
 
-                cost, components = 0, {v: set([v]) for v in route}
+                    cost, components = mst.kruskal(len(vertices), us, vs, ws)
+                    if components == 1:
+                        return cost
 
-                for u, v, d in edges:
-                    if not components[u].intersection(components[v]):
-                        cost += d
+                us, vs, ws = self.edges(vertices)
 
-                        components[u] = components[u].union(components[v])
-                        components[v] = components[u]
+                return mst.kruskal(len(vertices), us, vs, ws)[0]
 
-                        for root, component in components.items():
-                            if u in component or v in component:
-                                for vertex in component:
-                                    components[root] = components[root].union(
-                                        components[vertex])
-
-                return cost
+            @cached(key=unordered)
+            def prim(self, route):
+                return mst.prim(self.distances(list(dict.fromkeys(route))))
 
         class Criterion:
+            @vectorized(lambda self, c, b, a: np.degrees(
+                np.arctan2(c[:, 1] - b[:, 1], c[:, 0] - b[:, 0]) -
+                np.arctan2(a[:, 1] - b[:, 1], a[:, 0] - b[:, 0])
+            ))
             def angle(self, c, b, a):
                 from math import degrees, atan2
 
+                a, b, c = self.city(a), self.city(b), self.city(c)
+
                 return degrees(
                     atan2(c[1]-b[1], c[0]-b[0]) - atan2(a[1]-b[1], a[0]-b[0])
                 )
 
+            @vectorized(lambda self, a, b, c: self.vectorized('metric')(a, c) / (
+                self.vectorized('metric')(a, b) +
+                self.vectorized('metric')(b, c)
+            ))
             def eccentricity(self, a, b, c):
-                d1 = self.metric(a, b)
-                d2 = self.metric(b, c)
-                d3 = self.metric(a, c)
+                d1 = self.distance(a, b)
+                d2 = self.distance(b, c)
+                d3 = self.distance(a, c)
 
                 return d3 / (d1 + d2)
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
+        self.MATRIX = kwargs.get('matrix', False)
+        self.NEIGHBORS = kwargs.get('neighbors', 10)
+        self.FIRST_IMPROVEMENT = kwargs.get('first_improvement', False)
+        self.SEGMENT_LENGTH = kwargs.get('segment_length', 3)
+        self.DEPTH = kwargs.get('depth', 50)
+        self.BREADTH = kwargs.get('breadth', 5)
+        self.MST_NEIGHBORS = kwargs.get('mst_neighbors', None)
+        self.BLOCK_SIZE = kwargs.get('block_size', 2 ** 20)
+        self.EPSILON = kwargs.get('epsilon', 1e-9)
+        self.SYMMETRIC = kwargs.get('symmetric', None)
+
+        self.matrix = None
+
+    def encode(self, depot, cities):
+        if not self.MATRIX:
+            return depot, cities
+
+        points = [depot] + cities
+        if self.matrix is None or not self.matrix.covers(points):
+            self.matrix = DistanceMatrix(
+                points, self.metric, self.vectorized('metric')
+            )
+
+            self.invalidate()
+
+        return self.matrix.index[depot], self.matrix.encode(cities)
+
+    def decode(self, route):
+        if self.matrix is None:
+            return route
+
+        return self.matrix.decode(route)
+
+    def city(self, city):
+        if self.matrix is None:
+            return city
+
+        return self.matrix.points[city]
+
+    def symmetric(self):
+        if self.SYMMETRIC is not None:
+            return self.SYMMETRIC
+
+        return bool(self.annotation('metric', 'symmetric'))
+
+    def space(self, depot, cities):
+        if self.matrix is not None:
+            return self.matrix, depot, cities
+
+        space = DistanceFunction(
+            [depot] + cities, self.metric, self.vectorized('metric'),
+            self.symmetric()
+        )
+
+        return space, 0, list(range(1, len(cities) + 1))
+
+    def distances(self, cities):
+        if self.matrix is not None:
+            cities = np.asarray(cities, dtype=np.intp)
+
+            distances = self.matrix[np.ix_(cities, cities)]
+        else:
+            distances = DistanceMatrix(
+                cities, self.metric, self.vectorized('metric')
+            ).distances
+
+        return np.minimum(distances, distances.T)
+
+    def edges(self, cities, k=None):
+        if k is None:
+            distances = self.distances(cities)
+
+            us, vs = np.triu_indices(len(cities), 1)
+
+            return us, vs, distances[us, vs]
+
+        if self.matrix is not None:
+            distances = self.distances(cities)
+            np.fill_diagonal(distances, np.inf)
+
+            neighbors = nearest(distances, k)
+        else:
+            space = DistanceFunction(
+                cities, self.metric, self.vectorized('metric')
+            )
+
+            neighbors = space.neighbors(k)
+
+        us = np.repeat(np.arange(len(cities)), [len(n) for n in neighbors])
+        vs = np.asarray([v for n in neighbors for v in n], dtype=np.intp)
+
+        if self.matrix is not None:
+            ws = distances[us, vs]
+        else:
+            ws = np.asarray([
+                min(space.item(u, v), space.item(v, u))
+                for u, v in zip(us.tolist(), vs.tolist())
+            ], dtype=float)
+
+        return us, vs, ws
+
+    @cached(maxsize=1, key=frozenset)
+    def candidates(self, route):
+        space, _, _ = self.space(route[0], route[1:])
+
+        points = range(len(space)) if space is self.matrix else space.points
+
+        return {
+            points[i]: [points[j] for j in neighbors]
+            for i, neighbors in enumerate(space.neighbors(self.NEIGHBORS))
+        }
+
+    def recombine(self, operator, individual_a, individual_b):
+        cities = individual_a[1:-1]
+
+        index = {city: i for i, city in enumerate(cities)}
+
+        child = operator(
+            list(range(len(cities))),
+            [index[city] for city in individual_b[1:-1]]
+        )
+
+        return [individual_a[0]] + [cities[i] for i in child] + [individual_a[-1]]
+
+    def distance(self, a, b):
+        if self.matrix is None:
+            return self.metric(a, b)
+
+        return self.matrix[a, b]
+
     def cost(self, route):
+        if self.matrix is not None:
+            return self.matrix.cost(route)
+
         return sum([
             self.metric(route[i], route[i + 1])
             for i in range(len(route) - 1)
         ])
 
+    def costs(self, routes):
+        if self.matrix is not None:
+            return self.matrix.costs(routes)
+
+        metric = self.vectorized('metric')
+        if metric is not None:
+            routes = np.asarray(routes, dtype=float)
+
+            return metric(routes[:, :-1], routes[:, 1:]).sum(axis=1)
+
+        return np.asarray([self.cost(route) for route in routes], dtype=float)
+
+    def delta(self, route, move):
+        if self.matrix is not None:
+            return move.delta(route, self.matrix.item, self.matrix.symmetric)
+
+        return move.delta(route, self.metric, self.symmetric())
+
     def nearest_neighbor(self, *args, **kwargs):
-        depot, cities = args[0], args[1]
+        depot, cities = self.encode(args[0], args[1])
+
+        if self.annotation('metric', 'minkowski'):
+            route = self._nearest_neighbor_tree(depot, cities)
+
+            return self.decode(route + [depot]), self.cost(route + [depot])
+
+        if self.matrix is not None:
+            route = self._nearest_neighbor(depot, cities)
+
+            return self.decode(route + [depot]), self.cost(route + [depot])
 
         route, remaining = [depot], cities[:]
 
@@ -143,82 +397,546 @@ class TravellingSalesman(SimulatedAnnealing, GeneticAlgorithm):
 
         return route + [depot], self.cost(route + [depot])
 
+    def _nearest_neighbor(self, depot, cities):
+        route, remaining = [depot], np.asarray(cities, dtype=np.intp)
+
+        visited = np.zeros(len(remaining), dtype=bool)
+        for _ in range(len(remaining)):
+            distances = np.where(
+                visited, np.inf, self.matrix[route[-1], remaining]
+            )
+
+            nearest = int(distances.argmin())
+
+            visited[nearest] = True
+            route.append(int(remaining[nearest]))
+
+        return route
+
+    def _nearest_neighbor_tree(self, depot, cities):
+        points = [self.city(city) for city in cities]
+
+        tree = KDTree(points, self.metric)
+
+        route, current = [depot], self.city(depot)
+        for _ in range(len(points)):
+            nearest = tree.nearest(current)
+
+            tree.remove(nearest)
+
+            route.append(cities[nearest])
+            current = points[nearest]
+
+        return route
+
     def convex_hull(self, *args, **kwargs):
-        depot, cities = args[0], args[1]
-
-        route = jarvis([depot] + cities)
-        inner = set([depot] + cities).difference(set(route))
-        while inner:
-            best, best_i, best_value = None, -1, float("-inf")
-            for candidate in inner:
-                for i in range(len(route) - 1):
-                    value_candidate = self.criterion(
-                        route[i], candidate, route[i + 1]
-                    )
-                    if value_candidate > best_value:
-                        best_value = value_candidate
-                        best = candidate
-                        best_i = i
-
-            inner.remove(best)
-            route = route[:best_i + 1] + [best] + route[best_i + 1:]
+        depot, cities = self.encode(args[0], args[1])
+
+        elements = [depot] + cities
+        points = [self.city(element) for element in elements]
+
+        index = {point: i for i, point in enumerate(points)}
+
+        route = [index[point] for point in monotone_chain(points)]
+        if len(route) < 2:
+            route = list(range(len(elements)))
+
+        route = [elements[i] for i in self._insertion(points, elements, route)]
 
         while route[0] != depot:
             route.insert(0, route.pop())
 
-        return route + [depot], self.cost(route + [depot])
+        return self.decode(route + [depot]), self.cost(route + [depot])
+
+    def _insertion(self, points, elements, route):
+        criterion = self.vectorized('criterion')
+
+        if criterion is not None and self.vectorized('metric') is not None:
+            coordinates = np.asarray(points, dtype=float)
+
+            def evaluate(a, c, b):
+                return criterion(coordinates[a], coordinates[c], coordinates[b])
+        else:
+            criterion = self.criterion
+
+            def evaluate(a, c, b):
+                return np.fromiter((
+                    criterion(elements[i], elements[k], elements[j])
+                    for i, k, j in zip(a.tolist(), c.tolist(), b.tolist())
+                ), dtype=float, count=len(a))
+
+        n = len(points)
+
+        succ = np.full(n, -1, dtype=np.intp)
+        succ[route[:-1]] = route[1:]
+
+        remaining = np.ones(n, dtype=bool)
+        remaining[route] = False
+
+        best = np.full(n, -np.inf)
+
+        heap, counter = [], count()
+
+        def push(c, a, value):
+            best[c] = value
+            heappush(heap, (-value, next(counter), c, a, int(succ[a])))
+
+        def recompute(candidates):
+            a = np.flatnonzero(succ != -1)
+            b = succ[a]
+
+            block = max(1, self.BLOCK_SIZE // max(1, len(a)))
+            for beg in range(0, len(candidates), block):
+                c = candidates[beg:beg + block]
+
+                values = evaluate(
+                    np.tile(a, len(c)), np.repeat(c, len(a)), np.tile(b, len(c))
+                ).reshape(len(c), len(a))
+
+                for k, i in enumerate(values.argmax(axis=1).tolist()):
+                    push(int(c[k]), int(a[i]), float(values[k, i]))
+
+        recompute(np.flatnonzero(remaining))
+
+        while heap:
+            _, _, c, a, b = heappop(heap)
+
+            if not remaining[c]:
+                continue
+
+            if succ[a] != b:
+                recompute(np.asarray([c], dtype=np.intp))
+                continue
+
+            succ[a], succ[c] = c, b
+            remaining[c] = False
+
+            candidates = np.flatnonzero(remaining)
+            if len(candidates) == 0:
+                break
+
+            for head in (a, c):
+                values = evaluate(
+                    np.full(len(candidates), head),
+                    candidates,
+                    np.full(len(candidates), succ[head])
+                )
+
+                improved = values > best[candidates]
+                for k in np.flatnonzero(improved).tolist():
+                    push(int(candidates[k]), head, float(values[k]))
+
+        route, current = [], route[0]
+        while current != -1:
+            route.append(current)
+            current = int(succ[current])
+
+        return route
 
     def opt_2(self, *args, **kwargs):
-        depot, cities = args[0], args[1]
+        budget = self.budget()
+
+        depot, cities = self.encode(args[0], args[1])
+
+        space, start, labels = self.space(depot, cities)
+
+        if self.FIRST_IMPROVEMENT or not space.symmetric:
+            route = self._opt_2([depot] + cities + [depot], budget)
+        else:
+            tour = Tour([start] + labels)
+
+            self._opt_2_tour(
+                tour, space.item, space.neighbors(self.NEIGHBORS), budget
+            )
+
+            route = tour.route(start)
+            if space is not self.matrix:
+                route = space.decode(route)
+
+        return self.decode(route), self.cost(route)
+
+    def _opt_2(self, route, budget):
+        improved = True
+        while improved:
+            improved = False
+            for i in range(1, len(route) - 2):
+                budget.spend()
+                if budget.exhausted():
+                    return route
+
+                for j in range(i + 1, len(route) - 1):
+                    move = Reverse(i, j)
+                    if self.delta(route, move) < -self.EPSILON:
+                        move.apply(route)
+                        improved = True
+                        break
+
+                if improved:
+                    break
 
-        def reverse_sublist(elements, i, j):
-            copy = elements[:]
+        return route
 
-            copy[i:j] = copy[i:j][::-1]
+    def _opt_2_tour(self, tour, distance, neighbors, budget):
+        active = [True] * len(neighbors)
+        queue = deque(tour)
 
-            return copy
+        while queue and not budget.exhausted():
+            a = queue.popleft()
+            active[a] = False
 
-        route = cities[:]
-        cost = self.cost([depot] + route + [depot])
-        for i in range(0, len(route) - 1):
-            for j in range(i + 1, len(route)):
-                candidate = reverse_sublist(route, i, j)
-                candidate_cost = self.cost([depot] + candidate + [depot])
-                if candidate_cost < cost:
-                    return self.opt_2(depot, candidate)
+            budget.spend()
 
-        return [depot] + route + [depot], self.cost([depot] + route + [depot])
+            improved = False
+            for successor in (True, False):
+                b = tour.succ(a) if successor else tour.pred(a)
+                d_ab = distance(a, b)
+
+                for c in neighbors[a]:
+                    d_ac = distance(a, c)
+                    if d_ac >= d_ab:
+                        break
+
+                    d = tour.succ(c) if successor else tour.pred(c)
+                    if c == b or d == a:
+                        continue
+
+                    delta = d_ac + distance(b, d) - d_ab - distance(c, d)
+                    if delta < -self.EPSILON:
+                        tour.move(a, b, c, d)
+
+                        improved = True
+                        break
+
+                if improved:
+                    for city in (a, b, c, d):
+                        if not active[city]:
+                            active[city] = True
+                            queue.append(city)
+
+                    break
+
+    def or_opt(self, *args, **kwargs):
+        budget = self.budget()
+
+        depot, cities = self.encode(args[0], args[1])
+
+        space, start, labels = self.space(depot, cities)
+        if not space.symmetric:
+            raise ValueError('Or-opt requires a symmetric metric')
+
+        tour = Tour([start] + labels)
+
+        self._or_opt_tour(
+            tour, space.item, space.neighbors(self.NEIGHBORS), budget
+        )
+
+        route = tour.route(start)
+        if space is not self.matrix:
+            route = space.decode(route)
+
+        return self.decode(route), self.cost(route)
+
+    def _or_opt_tour(self, tour, distance, neighbors, budget):
+        active = [True] * len(neighbors)
+        queue = deque(tour)
+
+        def segments(a):
+            for length in range(1, min(self.SEGMENT_LENGTH, len(tour) - 3) + 1):
+                end = a
+                for _ in range(length - 1):
+                    end = tour.succ(end)
+
+                yield a, end
+
+                if length > 1:
+                    beg = a
+                    for _ in range(length - 1):
+                        beg = tour.pred(beg)
+
+                    yield beg, a
+
+        def inside(city, beg, end):
+            return tour.between(beg, city, end)
+
+        while queue and not budget.exhausted():
+            a = queue.popleft()
+            active[a] = False
+
+            budget.spend()
+
+            improved = None
+            for beg, end in segments(a):
+                p, n = tour.pred(beg), tour.succ(end)
+
+                g = distance(p, beg) + distance(end, n) - distance(p, n)
+
+                for endpoint in (beg, end):
+                    for x in neighbors[endpoint]:
+                        d_x = distance(endpoint, x)
+                        if d_x >= g:
+                            break
+
+                        if inside(x, beg, end):
+                            continue
+
+                        for c, e in ((x, tour.succ(x)), (tour.pred(x), x)):
+                            if inside(c, beg, end) or inside(e, beg, end):
+                                continue
+
+                            d_ce = distance(c, e)
+
+                            forward = distance(c, beg) + distance(end, e)
+                            reverse = distance(c, end) + distance(beg, e)
+
+                            delta = min(forward, reverse) - d_ce - g
+                            if delta < -self.EPSILON:
+                                improved = (p, beg, end, n, c, e, forward < reverse)
+                                break
+
+                        if improved:
+                            break
+
+                    if improved:
+                        break
+
+                if improved:
+                    break
+
+            if improved:
+                p, beg, end, n, c, e, forward = improved
+
+                if c == n:
+                    tour.move(p, beg, n, e)
+                elif e == p:
+                    tour.move(c, p, end, n)
+                else:
+                    tour.move(p, beg, c, e)
+                    tour.move(p, c, n, end)
+
+                if forward:
+                    tour.move(c, end, beg, e)
+
+                for city in (a, p, beg, end, n, c, e):
+                    if not active[city]:
+                        active[city] = True
+                        queue.append(city)
+
+    def lin_kernighan(self, *args, **kwargs):
+        budget = self.budget()
+
+        depot, cities = self.encode(args[0], args[1])
+
+        space, start, labels = self.space(depot, cities)
+        if not space.symmetric:
+            raise ValueError('Lin-Kernighan requires a symmetric metric')
+
+        tour = Tour([start] + labels)
+
+        self._lin_kernighan_tour(
+            tour, space.item, space.neighbors(self.NEIGHBORS), budget
+        )
+
+        route = tour.route(start)
+        if space is not self.matrix:
+            route = space.decode(route)
+
+        # Never hand back a route worse than the one provided
+        initial = [depot] + cities + [depot]
+        if self.cost(initial) < self.cost(route):
+            route = initial
+
+        return self.decode(route), self.cost(route)
+
+    def _lin_kernighan_tour(self, tour, distance, neighbors, budget):
+        if len(tour) < 5:
+            return
+
+        active = [True] * len(neighbors)
+        queue = deque(tour)
+
+        while queue and not budget.exhausted():
+            t1 = queue.popleft()
+            active[t1] = False
+
+            budget.spend()
+
+            for t2 in (tour.succ(t1), tour.pred(t1)):
+                touched = self._lin_kernighan_step(
+                    tour, distance, neighbors, t1, t2
+                )
+
+                if touched:
+                    for city in touched:
+                        if not active[city]:
+                            active[city] = True
+                            queue.append(city)
+
+                    break
+
+    def _lin_kernighan_step(self, tour, distance, neighbors, t1, t2):
+        def candidates(t2, gain, added, removed):
+            successor = tour.succ(t1) == t2
+
+            candidates = []
+            for t3 in neighbors[t2]:
+                g = gain - distance(t2, t3)
+                if g <= 0:
+                    break
+
+                t4 = tour.pred(t3) if successor else tour.succ(t3)
+                if t3 == t1 or t4 == t2 or \
+                        (t2, t3) in removed or (t3, t4) in added:
+                    continue
+
+                candidates.append((distance(t3, t4) - distance(t2, t3), t3, t4))
+
+            candidates.sort(reverse=True)
+
+            return candidates
+
+        gain = distance(t1, t2)
+
+        for _, t3, t4 in candidates(t2, gain, set(), set())[:self.BREADTH]:
+            moves, best = [], (self.EPSILON, 0)
+
+            added = {(t2, t3), (t3, t2)}
+            removed = {(t1, t2), (t2, t1)}
+
+            u2, u3, u4, g = t2, t3, t4, gain
+            while True:
+                g -= distance(u2, u3)
+
+                tour.move(t1, u2, u4, u3)
+                moves.append((u2, u3, u4))
+
+                closed = g + distance(u3, u4) - distance(u4, t1)
+                if closed > best[0]:
+                    best = (closed, len(moves))
+
+                g += distance(u3, u4)
+
+                removed.update({(u3, u4), (u4, u3)})
+
+                if len(moves) >= self.DEPTH:
+                    break
+
+                following = candidates(u4, g, added, removed)
+                if not following:
+                    break
+
+                u2, (_, u3, u4) = u4, following[0]
+
+                added.update({(u2, u3), (u3, u2)})
+
+            while len(moves) > best[1]:
+                u2, u3, u4 = moves.pop()
+
+                tour.move(t1, u4, u2, u3)
+
+            if moves:
+                return {t1} | {city for move in moves for city in move}
+
+        return None
 
     def simulated_annealing(self, *args, **kwargs):
-        depot, cities = args[0], args[1]
+        budget = self.budget()
+
+        depot, cities = self.encode(args[0], args[1])
 
-        return SimulatedAnnealing.fit(self, [depot] + cities + [depot])
+        best, best_cost = SimulatedAnnealing.fit(
+            self, [depot] + cities + [depot], budget
+        )
+
+        return self.decode(best), best_cost
 
     def genetic_algorithm(self, *args, **kwargs):
-        depot, cities = args[0], args[1]
+        budget = self.budget()
+
+        depot, cities = self.encode(args[0], args[1])
+
+        fittest = GeneticAlgorithm.fit(
+            self, [depot] + cities + [depot], budget
+        )
+
+        return self.decode(fittest), self.cost(fittest)
+
+
+class Timeline(object):
+    def __init__(self, model, route, move):
+        super().__init__()
+
+        self.model, self.route, self.move = model, route[:], move
+
+        # The arrival time at a city coincides with the cost of the route
+        # up to that city, hence a single prefix array serves both purposes
+        self.arrivals, self.penalties = model.sweep(route[0], route[1:])
+        self.arrivals.insert(0, 0)
+        self.penalties.insert(0, 0)
+
+        self.cost, self.penalty = self.arrivals[-1], self.penalties[-1]
+
+        self.pending = None
+
+    def propose(self):
+        return self.move.random(self.route)
+
+    def evaluate(self, move):
+        first = move.first
+
+        arrivals, penalties = self.model.sweep(
+            self.route[first - 1],
+            move.suffix(self.route),
+            self.arrivals[first - 1],
+            self.penalties[first - 1]
+        )
+
+        self.pending = (move, first, arrivals, penalties)
+
+        return arrivals[-1], penalties[-1]
+
+    def apply(self, move):
+        if self.pending is None or self.pending[0] is not move:
+            self.evaluate(move)
+
+        _, first, arrivals, penalties = self.pending
+
+        move.apply(self.route)
+
+        self.arrivals[first:] = arrivals
+        self.penalties[first:] = penalties
 
-        fittest = GeneticAlgorithm.fit(self, [depot] + cities + [depot])
+        self.cost, self.penalty = self.arrivals[-1], self.penalties[-1]
 
-        return fittest, self.cost(fittest)
+        self.pending = None
+
+        return self.route
+
+    def sample(self, size):
+        return self.model.sweeps([
+            self.propose().apply(self.route[:]) for _ in range(size)
+        ])
+
+    def snapshot(self):
+        return self.route[:]
 
 
 class TravellingSalesmanTimeWindows(TravellingSalesman, CompressedAnnealing):
     class Traits(TravellingSalesman.Traits, CompressedAnnealing.Traits):
         class Fitness(TravellingSalesman.Traits.Fitness):
             def inverse_cost(self, individual):
-                c = 0.5 * self.cost(individual) + 0.5 * self.penalty(individual)
+                c = 0.5 * sum(self.evaluate(individual))
 
                 return 1.0 / c
 
             def unweighted_mst(self, individual):
                 v = len(individual) - 1
 
-                c = 0.5 * self.cost(individual) + 0.5 * self.penalty(individual)
+                c = 0.5 * sum(self.evaluate(individual))
 
                 return ((v * v) - v + 1) / c
 
             def weighted_mst(self, individual):
-                c = 0.5 * self.cost(individual) + 0.5 * self.penalty(individual)
+                c = 0.5 * sum(self.evaluate(individual))
 
                 return self.heuristic(individual) / c
 
@@ -232,9 +950,14 @@ class TravellingSalesmanTimeWindows(TravellingSalesman, CompressedAnnealing):
         super().__init__(*args, **kwargs)
 
     def partial_cost(self, a, b):
-        return self.service(a) + self.metric(a, b)
+        return self.service(self.city(a)) + self.distance(a, b)
 
     def cost(self, route):
+        if self.matrix is not None:
+            return sum([
+                self.service(self.city(city)) for city in route[:-1]
+            ]) + self.matrix.cost(route)
+
         return sum([
             self.partial_cost(route[i], route[i + 1])
             for i in range(len(route) - 1)
@@ -243,26 +966,115 @@ class TravellingSalesmanTimeWindows(TravellingSalesman, CompressedAnnealing):
     def partial_penalty(self, arrival, a, b):
         arrival += self.partial_cost(a, b)
 
-        beg, end = self.timewindow(b)
+        beg, end = self.timewindow(self.city(b))
 
         start_of_service = max(arrival, beg)
 
-        penalty = max(0, start_of_service + self.service(b) - end)
+        penalty = max(0, start_of_service + self.service(self.city(b)) - end)
 
         return arrival, penalty
 
     def penalty(self, route):
-        arrival, penalty = 0, 0
+        return self.evaluate(route)[1]
+
+    def evaluate(self, route):
+        arrivals, penalties = self.sweep(route[0], route[1:])
+
+        if not arrivals:
+            return 0, 0
+
+        return arrivals[-1], penalties[-1]
+
+    def sweep(self, previous, suffix, arrival=0, penalty=0):
+        service, timewindow, city = self.service, self.timewindow, self.city
+
+        if self.matrix is not None:
+            distance = self.matrix.distances.item
+        else:
+            distance = self.metric
+
+        arrivals, penalties = [], []
+
+        service_time = service(city(previous))
+        for current in suffix:
+            arrival += service_time + distance(previous, current)
+
+            beg, end = timewindow(city(current))
+
+            service_time = service(city(current))
+
+            penalty += max(0, max(arrival, beg) + service_time - end)
+
+            arrivals.append(arrival)
+            penalties.append(penalty)
 
-        for i in range(len(route) - 1):
-            arrival, p = self.partial_penalty(arrival, route[i], route[i + 1])
-            penalty += p
+            previous = current
 
-        return penalty
+        return arrivals, penalties
+
+    def sweeps(self, routes):
+        index = {city: i for i, city in enumerate(dict.fromkeys(routes[0]))}
+
+        labels = np.asarray(
+            [[index[city] for city in route] for route in routes], dtype=np.intp
+        )
+
+        cities = list(index)
+
+        service = np.asarray(
+            [self.service(self.city(city)) for city in cities], dtype=float
+        )
+        timewindow = np.asarray(
+            [self.timewindow(self.city(city)) for city in cities], dtype=float
+        ).reshape(-1, 2)
+
+        # Neighboring routes share most of their legs, hence each distinct
+        # leg is only measured once
+        legs = labels[:, :-1] * len(cities) + labels[:, 1:]
+        legs, inverse = np.unique(legs, return_inverse=True)
+
+        distances = np.fromiter((
+            self.distance(cities[leg // len(cities)], cities[leg % len(cities)])
+            for leg in legs.tolist()
+        ), dtype=float, count=len(legs))[inverse.reshape(-1)].reshape(
+            labels.shape[0], -1
+        )
+
+        arrivals = np.zeros(len(routes))
+        penalties = np.zeros(len(routes))
+        for i in range(1, labels.shape[1]):
+            previous, current = labels[:, i - 1], labels[:, i]
+
+            arrivals += service[previous] + distances[:, i - 1]
+
+            penalties += np.maximum(0, np.maximum(
+                arrivals, timewindow[current, 0]
+            ) + service[current] - timewindow[current, 1])
+
+        return arrivals, penalties
+
+    def fingerprint(self, initial):
+        cities = [self.city(city) for city in initial]
+
+        return tuple(
+            (city, self.service(city), freeze(self.timewindow(city)))
+            for city in cities
+        ), vars(self).get('_metric'), vars(self).get('_mutate')
+
+    def neighborhood(self, route):
+        move = self.annotation('mutate', 'move')
+        if move is None:
+            return super().neighborhood(route)
+
+        return Timeline(self, route, move)
 
     def compressed_annealing(self, *args, **kwargs):
-        depot, cities = args[0], args[1]
+        budget = self.budget()
+
+        depot, cities = self.encode(args[0], args[1])
 
-        fittest = CompressedAnnealing.fit(self, [depot] + cities + [depot])
+        fittest = CompressedAnnealing.fit(
+            self, [depot] + cities + [depot], budget
+        )
 
-        return fittest, self.cost(fittest)
+        return self.decode(fittest), self.cost(fittest)
@@ -1,4 +1,13 @@
-
-from pytsp.core.util.decorators import cached
-from pytsp.core.util.jarvis import jarvis
+from pytsp.core.util.budget import Budget
+from pytsp.core.util.checkpoint import Checkpoint
+from pytsp.core.util.decorators import (Cache, cached, canonical, minkowski,
+                                        proposes, symmetric, unordered,
+                                        vectorized)
+from pytsp.core.util.jarvis import jarvis, monotone_chain
+from pytsp.core.util.kdtree import KDTree
+from pytsp.core.util.listener import Listener, LogListener
+from pytsp.core.util.matrix import DistanceFunction, DistanceMatrix, nearest
 from pytsp.core.util.model import Model
+from pytsp.core.util.mst import DisjointSet, kruskal, prim
+from pytsp.core.util.moves import Move, Reverse, Shift, Swap
+from pytsp.core.util.tour import Tour
@@ -0,0 +1,41 @@
+from time import perf_counter, time
+
+
+class Budget(object):
+    def __init__(self, time_limit=None, max_evaluations=None):
+        super().__init__()
+
+        self.deadline = None if time_limit is None else perf_counter() + time_limit
+
+        self.evaluations, self.max_evaluations = 0, max_evaluations
+
+    @classmethod
+    def until(cls, expiry, max_evaluations=None):
+        if expiry is None:
+            return cls(None, max_evaluations)
+
+        return cls(max(0.0, expiry - time()), max_evaluations)
+
+    def spend(self, evaluations=1):
+        self.evaluations += evaluations
+
+    def remaining(self):
+        if self.deadline is None:
+            return None
+
+        return max(0.0, self.deadline - perf_counter())
+
+    def expiry(self):
+        # Unlike the performance counter, the wall clock is shared by every
+        # process, hence workers are handed the deadline in that form
+        if self.deadline is None:
+            return None
+
+        return time() + self.remaining()
+
+    def exhausted(self):
+        if self.max_evaluations is not None and \
+                self.evaluations >= self.max_evaluations:
+            return True
+
+        return self.deadline is not None and perf_counter() >= self.deadline
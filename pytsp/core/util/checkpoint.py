@@ -0,0 +1,61 @@
+import os
+import pickle
+import random
+from pathlib import Path
+
+
+class Checkpoint(object):
+    def __init__(self, filename, interval, solver, key):
+        super().__init__()
+
+        self.file = Path(filename)
+        self.interval, self.solver, self.key = interval, solver, key
+
+        self.step = None
+
+    def due(self, step):
+        return step % self.interval == 0 and step != self.step
+
+    def save(self, step, budget, **state):
+        self.step = step
+
+        state = {
+            'solver': self.solver,
+            'key': self.key,
+            'step': step,
+            'evaluations': budget.evaluations,
+            'random': random.getstate(),
+            **state
+        }
+
+        # Writing to a sibling file first, so that a preempted run never
+        # leaves a truncated checkpoint behind
+        partial = self.file.with_name(f'{self.file.name}.partial')
+        with partial.open('wb') as stream:
+            pickle.dump(state, stream, protocol=pickle.HIGHEST_PROTOCOL)
+
+        os.replace(partial, self.file)
+
+    def restore(self, budget):
+        if not self.file.is_file():
+            return None
+
+        with self.file.open('rb') as stream:
+            state = pickle.load(stream)
+
+        if state['solver'] != self.solver:
+            raise ValueError(
+                f'`{self.file}` holds a `{state["solver"]}` checkpoint, '
+                f'not a `{self.solver}` one'
+            )
+
+        if state['key'] != self.key:
+            raise ValueError(f'`{self.file}` was saved for a different instance')
+
+        self.step = state['step']
+
+        random.setstate(state['random'])
+
+        budget.spend(state['evaluations'])
+
+        return state
@@ -0,0 +1,220 @@
+from itertools import chain
+from random import randrange, sample
+
+
+def cut(n):
+    return sorted(sample(range(n + 1), 2))
+
+
+def order(a, b):
+    n = len(a)
+    if n < 2:
+        return a[:]
+
+    i, j = cut(n)
+
+    child = a[:]
+
+    taken = bytearray(n)
+    for gene in a[i:j]:
+        taken[gene] = 1
+
+    k = j
+    for s in range(n):
+        gene = b[(j + s) % n]
+        if not taken[gene]:
+            child[k % n] = gene
+            k += 1
+
+    return child
+
+
+def partially_mapped(a, b):
+    n = len(a)
+    if n < 2:
+        return a[:]
+
+    i, j = cut(n)
+
+    position = [0] * n
+    for k, gene in enumerate(a):
+        position[gene] = k
+
+    taken = bytearray(n)
+    for gene in a[i:j]:
+        taken[gene] = 1
+
+    child = b[:]
+    child[i:j] = a[i:j]
+
+    # Each position of the segment lies on at most one mapping chain,
+    # hence resolving every conflict takes linear time overall
+    for k in chain(range(i), range(j, n)):
+        gene = b[k]
+        while taken[gene]:
+            gene = b[position[gene]]
+
+        child[k] = gene
+
+    return child
+
+
+def links(tour):
+    n = len(tour)
+
+    succ, pred = [0] * n, [0] * n
+    for k, city in enumerate(tour):
+        succ[city], pred[city] = tour[(k + 1) % n], tour[k - 1]
+
+    return succ, pred
+
+
+def ab_cycles(succ_a, pred_a, succ_b, pred_b):
+    n = len(succ_a)
+
+    # The edges of either parent that are missing from the other one
+    unique = (
+        [
+            [v for v in (succ_a[u], pred_a[u]) if v != succ_b[u] and v != pred_b[u]]
+            for u in range(n)
+        ],
+        [
+            [v for v in (succ_b[u], pred_b[u]) if v != succ_a[u] and v != pred_a[u]]
+            for u in range(n)
+        ]
+    )
+
+    cycles = []
+    for start in range(n):
+        while unique[0][start]:
+            # The edge leaving path[t] belongs to the first parent when t is
+            # even, so revisiting a city at the same parity closes a cycle
+            path, seen = [start], ({start: [0]}, {})
+            while True:
+                t = len(path) - 1
+
+                u, edges = path[t], unique[t % 2]
+                if not edges[u]:
+                    break
+
+                v = edges[u].pop(randrange(len(edges[u])))
+                edges[v].remove(u)
+
+                path.append(v)
+                t += 1
+
+                stack = seen[t % 2].get(v)
+                if stack:
+                    p = stack[-1]
+
+                    cycles.append((path[p:t], p % 2 == 0))
+
+                    for q in range(p + 1, t):
+                        seen[q % 2][path[q]].pop()
+
+                    del path[p + 1:]
+                else:
+                    seen[t % 2].setdefault(v, []).append(t)
+
+    return cycles
+
+
+def edge_assembly(a, b, distance, neighbors=None):
+    n = len(a)
+    if n < 4:
+        return a[:]
+
+    succ_a, pred_a = links(a)
+
+    cycles = ab_cycles(succ_a, pred_a, *links(b))
+    if not cycles:
+        return a[:]
+
+    nodes, first = cycles[randrange(len(cycles))]
+
+    adjacent = [[succ_a[u], pred_a[u]] for u in range(n)]
+    for k, u in enumerate(nodes):
+        v = nodes[(k + 1) % len(nodes)]
+
+        if (k % 2 == 0) == first:
+            adjacent[u].remove(v)
+            adjacent[v].remove(u)
+        else:
+            adjacent[u].append(v)
+            adjacent[v].append(u)
+
+    label, subtours = [-1] * n, {}
+    for start in range(n):
+        if label[start] >= 0:
+            continue
+
+        subtour, previous, u = [], -1, start
+        while label[u] < 0:
+            label[u] = start
+            subtour.append(u)
+
+            following = adjacent[u][0] if adjacent[u][0] != previous else adjacent[u][1]
+            previous, u = u, following
+
+        subtours[start] = subtour
+
+    # Merge the smallest subtour into another one by replacing an edge (u, u2)
+    # of the former and an edge (v, v2) of the latter with (u, v), (u2, v2),
+    # where v is a candidate neighbor of u, falling back to every city when
+    # no candidate neighbor belongs to another subtour
+    while len(subtours) > 1:
+        smallest = min(subtours, key=lambda k: len(subtours[k]))
+
+        best = None
+        for pool in (neighbors, None):
+            for u in subtours[smallest]:
+                removed = [(u2, distance(u, u2)) for u2 in adjacent[u]]
+
+                for v in (range(n) if pool is None else pool(u)):
+                    if label[v] == smallest:
+                        continue
+
+                    d_uv = distance(u, v)
+
+                    for v2 in adjacent[v]:
+                        d_vv2 = distance(v, v2)
+
+                        for u2, d_uu2 in removed:
+                            gain = d_uv + distance(u2, v2) - d_uu2 - d_vv2
+                            if best is None or gain < best[0]:
+                                best = (gain, u, u2, v, v2)
+
+            if best is not None:
+                break
+
+        _, u, u2, v, v2 = best
+
+        adjacent[u].remove(u2)
+        adjacent[u2].remove(u)
+        adjacent[v].remove(v2)
+        adjacent[v2].remove(v)
+
+        adjacent[u].append(v)
+        adjacent[v].append(u)
+        adjacent[u2].append(v2)
+        adjacent[v2].append(u2)
+
+        merged = label[v]
+        for w in subtours[smallest]:
+            label[w] = merged
+
+        subtours[merged].extend(subtours.pop(smallest))
+
+    # Keep the orientation of the first parent around its first city
+    start = a[0]
+
+    following = succ_a[start] if succ_a[start] in adjacent[start] else adjacent[start][0]
+
+    child, previous, u = [start], start, following
+    while u != start:
+        child.append(u)
+
+        following = adjacent[u][0] if adjacent[u][0] != previous else adjacent[u][1]
+        previous, u = u, following
+
+    return child
@@ -1,13 +1,129 @@
-
+from collections import OrderedDict
 from functools import wraps
 
 
-def cached(method):
+def freeze(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(element) for element in value)
+
+    if isinstance(value, (set, frozenset)):
+        return frozenset(freeze(element) for element in value)
+
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+
+    return value
+
+
+def canonical(*args, **kwargs):
+    return freeze(args), freeze(kwargs)
+
+
+def unordered(*args, **kwargs):
+    return canonical(*[frozenset(freeze(arg)) for arg in args], **kwargs)
+
+
+class Cache(object):
+    def __init__(self, maxsize=128):
+        super().__init__()
+
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+
+        self.hits, self.misses, self.evictions = 0, 0, 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key):
+        value = self.entries[key]
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+
+        return value
+
+    def put(self, key, value):
+        self.misses += 1
+
+        self.entries[key] = value
+
+        if self.maxsize is not None and len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+        return value
+
+    def clear(self):
+        self.entries.clear()
+
+    def info(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self.entries),
+            'maxsize': self.maxsize
+        }
+
+
+def cached(method=None, *, maxsize=128, key=canonical):
+    if method is None:
+        return lambda method: cached(method, maxsize=maxsize, key=key)
+
     @wraps(method)
-    def wrapper(*args, **kwargs):
-        if not hasattr(wrapper, 'cache'):
-            setattr(wrapper, 'cache', method(*args, **kwargs))
+    def wrapper(instance, *args, **kwargs):
+        cache = wrapper.cache(instance)
+
+        k = key(*args, **kwargs)
+        if k in cache:
+            return cache.get(k)
+
+        return cache.put(k, method(instance, *args, **kwargs))
+
+    def cache(instance):
+        caches = vars(instance).setdefault('_caches', {})
+        if wrapper.__qualname__ not in caches:
+            caches[wrapper.__qualname__] = Cache(maxsize)
 
-        return wrapper.cache
+        return caches[wrapper.__qualname__]
+
+    def invalidate(instance):
+        cache(instance).clear()
+
+    wrapper.cache, wrapper.invalidate = cache, invalidate
 
     return wrapper
+
+
+def vectorized(implementation):
+    def decorator(method):
+        setattr(method, 'vectorized', implementation)
+
+        return method
+
+    return decorator
+
+
+def proposes(move):
+    def decorator(method):
+        setattr(method, 'move', move)
+
+        return method
+
+    return decorator
+
+
+def minkowski(method):
+    setattr(method, 'minkowski', True)
+
+    return method
+
+
+def symmetric(method):
+    setattr(method, 'symmetric', True)
+
+    return method
@@ -1,3 +1,5 @@
+import numpy as np
+
 
 def orientation(p1, p2, p3):
     return (p3[1] - p1[1]) * (p2[0] - p1[0]) - (p2[1] - p1[1]) * (p3[0] - p1[0])
@@ -43,3 +45,46 @@ def jarvis(points):
         convex_hull.append(current)
 
     return convex_hull
+
+
+def akl_toussaint(points):
+    coordinates = np.asarray(points).T
+
+    s, d = coordinates[0] + coordinates[1], coordinates[0] - coordinates[1]
+
+    polygon = [points[i] for i in (s.argmin(), d.argmax(), s.argmax(), d.argmin())]
+
+    inside = np.ones(len(points), dtype=bool)
+    for i in range(len(polygon)):
+        inside &= orientation(polygon[i], polygon[i - 3], coordinates) > 0
+
+    return [point for point, discard in zip(points, inside.tolist()) if not discard]
+
+
+def monotone_chain(points):
+    if len(points) < 3:
+        return []
+
+    points = sorted(akl_toussaint(points))
+
+    unique = [points[0]]
+    for point in points[1:]:
+        if point != unique[-1]:
+            unique.append(point)
+
+    if len(unique) < 3:
+        return unique
+
+    def chain(points):
+        hull = []
+        for point in points:
+            while len(hull) >= 2 and orientation(hull[-2], hull[-1], point) <= 0:
+                hull.pop()
+
+            hull.append(point)
+
+        return hull[:-1]
+
+    hull = chain(unique) + chain(reversed(unique))
+
+    return hull[:1] + hull[:0:-1]
@@ -0,0 +1,113 @@
+import numpy as np
+
+
+class KDTree(object):
+    LEAF_SIZE = 8
+
+    def __init__(self, points, metric):
+        super().__init__()
+
+        self.points = [tuple(point) for point in points]
+        self.metric = metric
+
+        self.alive = [True] * len(self.points)
+        self.leaf = [-1] * len(self.points)
+
+        self.axis, self.split, self.children = [], [], []
+        self.bucket, self.parent, self.count = [], [], []
+
+        if self.points:
+            coordinates = np.asarray(self.points, dtype=float)
+
+            self._build(coordinates, np.arange(len(self.points)), -1, 0)
+
+    def __len__(self):
+        return self.count[0] if self.count else 0
+
+    def _node(self, parent, count):
+        self.axis.append(-1)
+        self.split.append(None)
+        self.children.append(None)
+        self.bucket.append(None)
+        self.parent.append(parent)
+        self.count.append(count)
+
+        return len(self.count) - 1
+
+    def _build(self, coordinates, indices, parent, depth):
+        node = self._node(parent, len(indices))
+
+        if len(indices) <= self.LEAF_SIZE:
+            self.bucket[node] = indices.tolist()
+            for i in self.bucket[node]:
+                self.leaf[i] = node
+
+            return node
+
+        axis = depth % coordinates.shape[1]
+
+        order = indices[np.argsort(coordinates[indices, axis], kind='stable')]
+        middle = len(order) // 2
+
+        self.axis[node] = axis
+        self.split[node] = float(coordinates[order[middle], axis])
+
+        left = self._build(coordinates, order[:middle], node, depth + 1)
+        right = self._build(coordinates, order[middle:], node, depth + 1)
+
+        self.children[node] = (left, right)
+
+        return node
+
+    def remove(self, i):
+        if not self.alive[i]:
+            return
+
+        self.alive[i] = False
+
+        node = self.leaf[i]
+        while node != -1:
+            self.count[node] -= 1
+            node = self.parent[node]
+
+    def nearest(self, point):
+        point = tuple(point)
+
+        metric, points, alive = self.metric, self.points, self.alive
+        axes, splits, children = self.axis, self.split, self.children
+        buckets, count = self.bucket, self.count
+
+        best = [float('inf'), -1]
+
+        def visit(node):
+            if count[node] == 0:
+                return
+
+            bucket = buckets[node]
+            if bucket is not None:
+                for i in bucket:
+                    if alive[i]:
+                        distance = metric(point, points[i])
+                        if distance < best[0]:
+                            best[0], best[1] = distance, i
+
+                return
+
+            axis, split = axes[node], splits[node]
+            left, right = children[node]
+
+            if point[axis] < split:
+                near, far = left, right
+            else:
+                near, far = right, left
+
+            visit(near)
+
+            projection = point[:axis] + (split,) + point[axis + 1:]
+            if metric(point, projection) < best[0]:
+                visit(far)
+
+        if count:
+            visit(0)
+
+        return best[1]
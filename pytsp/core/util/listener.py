@@ -0,0 +1,50 @@
+from numbers import Integral, Real
+
+
+class Listener(object):
+    def on_iteration(self, model, **event):
+        pass
+
+    def on_improvement(self, model, **event):
+        pass
+
+    def on_temperature_change(self, model, **event):
+        pass
+
+    def on_generation(self, model, **event):
+        pass
+
+
+class LogListener(Listener):
+    def __init__(self, logger):
+        super().__init__()
+
+        self.logger = logger
+
+    @staticmethod
+    def format(value):
+        if isinstance(value, Integral):
+            return '%04d' % (value,)
+
+        if isinstance(value, Real):
+            return '%.3f' % (value,)
+
+        return str(value)
+
+    def log(self, event):
+        self.logger.info(', '.join(
+            f'{key.replace("_", " ").title()}: {self.format(value)}'
+            for key, value in event.items()
+        ))
+
+    def on_iteration(self, model, **event):
+        self.log(event)
+
+    def on_improvement(self, model, **event):
+        self.log(event)
+
+    def on_temperature_change(self, model, **event):
+        self.log(event)
+
+    def on_generation(self, model, **event):
+        self.log(event)
@@ -0,0 +1,131 @@
+from heapq import nsmallest
+
+import numpy as np
+
+
+def nearest(distances, k):
+    k = min(k, distances.shape[1] - 1)
+    if k <= 0:
+        return [[] for _ in range(distances.shape[0])]
+
+    candidates = np.argpartition(distances, k - 1, axis=1)[:, :k]
+
+    order = np.take_along_axis(distances, candidates, axis=1).argsort(axis=1)
+
+    return np.take_along_axis(candidates, order, axis=1).tolist()
+
+
+class DistanceMatrix(object):
+    def __init__(self, points, metric, vectorized=None):
+        super().__init__()
+
+        self.points = list(points)
+        self.index = {point: i for i, point in enumerate(self.points)}
+
+        if vectorized is not None:
+            coordinates = np.asarray(self.points, dtype=float)
+
+            self.distances = np.asarray(vectorized(
+                coordinates[:, np.newaxis],
+                coordinates[np.newaxis]
+            ), dtype=float)
+        else:
+            self.distances = np.empty((len(self.points), len(self.points)))
+
+            for i, a in enumerate(self.points):
+                for j, b in enumerate(self.points):
+                    self.distances[i, j] = metric(a, b)
+
+        self.symmetric = bool(np.array_equal(self.distances, self.distances.T))
+
+        self.item = self.distances.item
+
+    def __len__(self):
+        return len(self.points)
+
+    def __getitem__(self, key):
+        return self.distances[key]
+
+    def covers(self, points):
+        return len(points) == len(self.points) and \
+            all(point in self.index for point in points)
+
+    def encode(self, route):
+        return [self.index[point] for point in route]
+
+    def decode(self, route):
+        return [self.points[i] for i in route]
+
+    def cost(self, route):
+        route = np.asarray(route, dtype=np.intp)
+
+        return float(self.distances[route[:-1], route[1:]].sum())
+
+    def costs(self, routes):
+        routes = np.asarray(routes, dtype=np.intp)
+
+        return self.distances[routes[:, :-1], routes[:, 1:]].sum(axis=1)
+
+    def neighbors(self, k):
+        distances = self.distances.copy()
+        np.fill_diagonal(distances, np.inf)
+
+        return nearest(distances, k)
+
+
+class DistanceFunction(object):
+    BLOCK_SIZE = 1024
+
+    def __init__(self, points, metric, vectorized=None, symmetric=False):
+        super().__init__()
+
+        self.points = list(points)
+        self.index = {point: i for i, point in enumerate(self.points)}
+
+        self.metric, self.vectorized = metric, vectorized
+
+        self.symmetric = symmetric
+
+    def __len__(self):
+        return len(self.points)
+
+    def encode(self, route):
+        return [self.index[point] for point in route]
+
+    def decode(self, route):
+        return [self.points[i] for i in route]
+
+    def item(self, i, j):
+        return self.metric(self.points[i], self.points[j])
+
+    def cost(self, route):
+        return sum([
+            self.item(route[i], route[i + 1])
+            for i in range(len(route) - 1)
+        ])
+
+    def neighbors(self, k):
+        n = len(self.points)
+
+        if self.vectorized is None:
+            return [
+                nsmallest(k, (j for j in range(n) if j != i),
+                          key=lambda j, i=i: self.item(i, j))
+                for i in range(n)
+            ]
+
+        coordinates = np.asarray(self.points, dtype=float)
+
+        neighbors = []
+        for beg in range(0, n, self.BLOCK_SIZE):
+            end = min(beg + self.BLOCK_SIZE, n)
+
+            distances = np.asarray(self.vectorized(
+                coordinates[beg:end, np.newaxis],
+                coordinates[np.newaxis]
+            ), dtype=float)
+            distances[np.arange(end - beg), np.arange(beg, end)] = np.inf
+
+            neighbors.extend(nearest(distances, k))
+
+        return neighbors
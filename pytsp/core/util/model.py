@@ -1,6 +1,51 @@
 
 from functools import partial
 from inspect import getmembers, isclass
+from logging import INFO
+from time import perf_counter
+from types import MethodType
+
+from pytsp.core.util.budget import Budget
+from pytsp.core.util.checkpoint import Checkpoint
+from pytsp.core.util.listener import LogListener
+
+
+def profiled(function, counter):
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            counter[0] += 1
+            counter[1] += perf_counter() - start
+
+    return wrapper
+
+
+class Trait(object):
+    def __init__(self, name, type):
+        super().__init__()
+
+        self.name, self.type = name, type
+
+        self.method = name.lower()
+        self.field = f'_{self.method}'
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+
+        raise AttributeError(
+            f'{owner.__name__!r} object has no `{self.name}` assigned')
+
+    def resolve(self, value):
+        if callable(value):
+            return value
+
+        if isinstance(value, str):
+            return getattr(self.type, value)
+
+        raise TypeError(f'Unexpected `{self.name}` type {type(value)}')
 
 
 class Meta(type):
@@ -20,22 +65,19 @@ class Meta(type):
             if field in attrs or method in attrs:
                 continue
 
-            def getter(self, field=field):
-                return partial(getattr(self, field), self)
+            attrs[method] = Trait(trait_name, trait_type)
 
-            def setter(self, value, trait_name=trait_name, trait_type=trait_type, field=field):
-                if callable(value):
-                    setattr(self, field, value)
-                elif isinstance(value, str):
-                    value = getattr(trait_type, value)
-                    setattr(self, field, value)
-                else:
-                    raise TypeError(
-                        f'Unexpected `{trait_name}` type {type(value)}')
+        model = super().__new__(cls, name, bases, attrs)
 
-            attrs[method] = property(getter, setter)
+        model._traits = {}
+        for base in reversed(model.__mro__):
+            for method, value in vars(base).items():
+                if isinstance(value, Trait):
+                    model._traits[method] = value
+                else:
+                    model._traits.pop(method, None)
 
-        return super().__new__(cls, name, bases, attrs)
+        return model
 
 
 class Model(object, metaclass=Meta):
@@ -45,7 +87,145 @@ class Model(object, metaclass=Meta):
     def __init__(self, *args, **kwargs):
         super().__init__()
 
-        for trait, _ in getmembers(self.Traits, predicate=isclass):
-            trait = trait.lower().replace('-', '_')
-            if trait in kwargs:
+        self._counters = {} if kwargs.get('profile', False) else None
+
+        for trait in self._traits:
+            if kwargs.get(trait) is not None:
                 setattr(self, trait, kwargs[trait])
+
+        self.STRIDE = kwargs.get('stride', 1)
+
+        self.TIME_LIMIT = kwargs.get('time_limit', None)
+        self.MAX_EVALUATIONS = kwargs.get('max_evaluations', None)
+
+        self.CHECKPOINT = kwargs.get('checkpoint', None)
+        self.CHECKPOINT_INTERVAL = kwargs.get('checkpoint_interval', 10)
+        self.RESUME = kwargs.get('resume', False)
+
+        self.listeners = list(kwargs.get('listeners', []))
+
+    def __setattr__(self, name, value):
+        trait = self._traits.get(name)
+        if trait is None:
+            return super().__setattr__(name, value)
+
+        vars(self)[trait.field] = trait.resolve(value)
+
+        self.bind(trait)
+
+        self.invalidate()
+
+    def bind(self, trait):
+        function = MethodType(vars(self)[trait.field], self)
+
+        counters = vars(self).get('_counters')
+        if counters is not None:
+            function = profiled(
+                function, counters.setdefault(trait.method, [0, 0.0])
+            )
+
+        vars(self)[trait.method] = function
+
+    def __getstate__(self):
+        state = {**vars(self), 'listeners': []}
+        for trait in self._traits:
+            state.pop(trait, None)
+
+        return state
+
+    def __setstate__(self, state):
+        vars(self).update(state)
+
+        for trait in self._traits.values():
+            if trait.field in state:
+                self.bind(trait)
+
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+
+        return listener
+
+    def unsubscribe(self, listener):
+        self.listeners.remove(listener)
+
+    def budget(self):
+        return Budget(self.TIME_LIMIT, self.MAX_EVALUATIONS)
+
+    def checkpoint(self, solver, key):
+        if self.CHECKPOINT is None:
+            return None
+
+        return Checkpoint(self.CHECKPOINT, self.CHECKPOINT_INTERVAL, solver, key)
+
+    def restore(self, checkpoint, budget):
+        if checkpoint is None or not self.RESUME:
+            return None
+
+        return checkpoint.restore(budget)
+
+    def observers(self):
+        logger = getattr(self, 'logger', None)
+
+        if logger is not None and logger.isEnabledFor(INFO):
+            return self.listeners + [LogListener(logger)]
+
+        return self.listeners[:]
+
+    def notify(self, observers, event, **kwargs):
+        for observer in observers:
+            getattr(observer, event)(self, **kwargs)
+
+    def profile(self):
+        return {
+            trait: {'calls': calls, 'time': time}
+            for trait, (calls, time) in (vars(self).get('_counters') or {}).items()
+            if calls > 0
+        }
+
+    def report(self, elapsed=None):
+        profile = sorted(
+            self.profile().items(), key=lambda item: item[1]['time'], reverse=True
+        )
+
+        lines = [
+            f'{"Trait":<24}{"Calls":>12}{"Time (s)":>12}{"Per Call (us)":>16}' +
+            (f'{"Share":>8}' if elapsed else '')
+        ]
+        for trait, counter in profile:
+            calls, time = counter['calls'], counter['time']
+
+            lines.append(
+                f'{trait:<24}{calls:>12d}{time:>12.3f}{1e6 * time / calls:>16.2f}' +
+                (f'{time / elapsed:>8.1%}' if elapsed else '')
+            )
+
+        return '\n'.join(lines)
+
+    def caches(self):
+        return {
+            name: cache.info()
+            for name, cache in vars(self).get('_caches', {}).items()
+        }
+
+    def invalidate(self):
+        for cache in vars(self).get('_caches', {}).values():
+            cache.clear()
+
+    def annotation(self, trait, name):
+        return getattr(getattr(self, f'_{trait}', None), name, None)
+
+    def vectorized(self, trait):
+        implementation = self.annotation(trait, 'vectorized')
+
+        if implementation is None:
+            return None
+
+        function = partial(implementation, self)
+
+        counters = vars(self).get('_counters')
+        if counters is None:
+            return function
+
+        return profiled(
+            function, counters.setdefault(f'{trait} (vectorized)', [0, 0.0])
+        )
@@ -0,0 +1,153 @@
+from abc import ABC, abstractmethod
+from random import randrange
+
+
+class Move(ABC):
+    def __init__(self, i, j):
+        super().__init__()
+
+        self.i, self.j = i, j
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.i}, {self.j})'
+
+    @classmethod
+    def random(cls, elements):
+        i, j = randrange(1, len(elements) -
+                         1), randrange(1, len(elements) - 1)
+
+        return cls(i, j)
+
+    @property
+    def first(self):
+        return min(self.i, self.j)
+
+    @abstractmethod
+    def apply(self, elements):
+        pass
+
+    @abstractmethod
+    def suffix(self, elements):
+        pass
+
+    @abstractmethod
+    def delta(self, elements, distance, symmetric=True):
+        pass
+
+
+class Swap(Move):
+    def apply(self, elements):
+        i, j = self.i, self.j
+
+        elements[i], elements[j] = elements[j], elements[i]
+
+        return elements
+
+    def suffix(self, elements):
+        i, j = min(self.i, self.j), max(self.i, self.j)
+
+        suffix = elements[i:]
+        suffix[0], suffix[j - i] = suffix[j - i], suffix[0]
+
+        return suffix
+
+    def delta(self, elements, distance, symmetric=True):
+        i, j = min(self.i, self.j), max(self.i, self.j)
+
+        if i == j:
+            return 0
+
+        a, b = elements[i], elements[j]
+        p, n = elements[i - 1], elements[j + 1]
+
+        if j == i + 1:
+            return (
+                distance(p, b) + distance(b, a) + distance(a, n)
+            ) - (
+                distance(p, a) + distance(a, b) + distance(b, n)
+            )
+
+        an, bp = elements[i + 1], elements[j - 1]
+
+        return (
+            distance(p, b) + distance(b, an) + distance(bp, a) + distance(a, n)
+        ) - (
+            distance(p, a) + distance(a, an) + distance(bp, b) + distance(b, n)
+        )
+
+
+class Shift(Move):
+    def apply(self, elements):
+        elements.insert(self.j, elements.pop(self.i))
+
+        return elements
+
+    def suffix(self, elements):
+        i, j = self.i, self.j
+
+        if i < j:
+            return elements[i + 1:j + 1] + [elements[i]] + elements[j + 1:]
+
+        return [elements[i]] + elements[j:i] + elements[i + 1:]
+
+    def delta(self, elements, distance, symmetric=True):
+        i, j = self.i, self.j
+
+        if i == j:
+            return 0
+
+        c = elements[i]
+        p, n = elements[i - 1], elements[i + 1]
+
+        if i < j:
+            a, b = elements[j], elements[j + 1]
+        else:
+            a, b = elements[j - 1], elements[j]
+
+        return (
+            distance(p, n) + distance(a, c) + distance(c, b)
+        ) - (
+            distance(p, c) + distance(c, n) + distance(a, b)
+        )
+
+
+class Reverse(Move):
+    @classmethod
+    def random(cls, elements):
+        i = randrange(1, len(elements) - 1)
+        j = randrange(1, len(elements) - 1)
+
+        return cls(min([i, j]), max([i, j]))
+
+    def apply(self, elements):
+        i, j = self.i, self.j
+
+        elements[i:j] = elements[i:j][::-1]
+
+        return elements
+
+    def suffix(self, elements):
+        i, j = self.i, self.j
+
+        return elements[i:j][::-1] + elements[j:]
+
+    def delta(self, elements, distance, symmetric=True):
+        i, j = self.i, self.j
+
+        if j - i < 2:
+            return 0
+
+        delta = (
+            distance(elements[i - 1], elements[j - 1]) +
+            distance(elements[i], elements[j])
+        ) - (
+            distance(elements[i - 1], elements[i]) +
+            distance(elements[j - 1], elements[j])
+        )
+
+        if not symmetric:
+            for k in range(i, j - 1):
+                delta += distance(elements[k + 1], elements[k]) - \
+                    distance(elements[k], elements[k + 1])
+
+        return delta
@@ -0,0 +1,75 @@
+import numpy as np
+
+
+class DisjointSet(object):
+    def __init__(self, n):
+        super().__init__()
+
+        self.parent = list(range(n))
+        self.rank = [0] * n
+
+        self.components = n
+
+    def find(self, x):
+        parent = self.parent
+
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+
+        return root
+
+    def union(self, a, b):
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return False
+
+        if self.rank[a] < self.rank[b]:
+            a, b = b, a
+
+        self.parent[b] = a
+        if self.rank[a] == self.rank[b]:
+            self.rank[a] += 1
+
+        self.components -= 1
+
+        return True
+
+
+def kruskal(n, us, vs, ws):
+    forest, cost = DisjointSet(n), 0.0
+
+    order = np.argsort(ws, kind='stable')
+    for u, v, w in zip(us[order].tolist(), vs[order].tolist(), ws[order].tolist()):
+        if forest.union(u, v):
+            cost += w
+
+            if forest.components == 1:
+                break
+
+    return cost, forest.components
+
+
+def prim(distances):
+    n = len(distances)
+    if n < 2:
+        return 0.0
+
+    visited = np.zeros(n, dtype=bool)
+    visited[0] = True
+
+    best, cost = distances[0].astype(float), 0.0
+    best[0] = np.inf
+
+    for _ in range(n - 1):
+        v = int(best.argmin())
+
+        cost += float(best[v])
+
+        visited[v] = True
+        best = np.where(visited, np.inf, np.minimum(best, distances[v]))
+
+    return cost
@@ -0,0 +1,22 @@
+from concurrent.futures import ProcessPoolExecutor
+from random import seed
+
+_model = None
+
+
+def _initialize(model):
+    global _model
+
+    _model = model
+
+
+def executor(model, workers=None):
+    return ProcessPoolExecutor(
+        max_workers=workers, initializer=_initialize, initargs=(model,)
+    )
+
+
+def dispatch(method, state, *args):
+    seed(state)
+
+    return getattr(_model, method)(*args)
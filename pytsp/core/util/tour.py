@@ -0,0 +1,60 @@
+class Tour(object):
+    def __init__(self, cities):
+        super().__init__()
+
+        self.order = list(cities)
+
+        self.position = [0] * (max(self.order) + 1)
+        for i, city in enumerate(self.order):
+            self.position[city] = i
+
+    def __len__(self):
+        return len(self.order)
+
+    def __iter__(self):
+        return iter(self.order)
+
+    def succ(self, city):
+        i = self.position[city] + 1
+
+        return self.order[i if i < len(self.order) else 0]
+
+    def pred(self, city):
+        return self.order[self.position[city] - 1]
+
+    def between(self, a, b, c):
+        i, j, k = self.position[a], self.position[b], self.position[c]
+
+        if i <= k:
+            return i <= j <= k
+
+        return j >= i or j <= k
+
+    def flip(self, a, b):
+        order, position, n = self.order, self.position, len(self.order)
+
+        i, j = position[a], position[b]
+
+        length = (j - i) % n + 1
+        if 2 * length > n:
+            i, j, length = (j + 1) % n, (i - 1) % n, n - length
+
+        for _ in range(length // 2):
+            ci, cj = order[i], order[j]
+
+            order[i], position[cj] = cj, i
+            order[j], position[ci] = ci, j
+
+            i = i + 1 if i + 1 < n else 0
+            j = j - 1 if j > 0 else n - 1
+
+    def move(self, a, b, c, d):
+        if self.succ(a) == b:
+            self.flip(b, c)
+        else:
+            self.flip(a, d)
+
+    def route(self, depot):
+        i = self.position[depot]
+
+        return self.order[i:] + self.order[:i] + [depot]
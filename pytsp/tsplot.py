@@ -4,8 +4,10 @@ from random import seed, uniform
 
 import click
 
-from pytsp.cli import Dictionary, Method, Timewindow, plot, safe
+from pytsp.cli import (Dictionary, Interval, Lookup, Method, Timewindow, plot,
+                       safe)
 from pytsp.core import TravellingSalesman, TravellingSalesmanTimeWindows
+from pytsp.util import bench as benchmark
 from pytsp.util import load
 
 
@@ -18,21 +20,18 @@ from pytsp.util import load
 )
 @click.option(
     '-m', '--metric',
-    type=Method(TravellingSalesman.Traits.Metric), default='euclidean',
-    help='the distance metric to be used',
-    show_default=True
+    type=Method(TravellingSalesman.Traits.Metric), default=None,
+    help='the distance metric to be used  [default: euclidean, or the metric of the input file]'
 )
 @click.option(
     '-x', '--x-axis', 'x_axis',
-    type=click.Tuple([float, float]), default=[0, 50],
-    help='the horizontal axis limits',
-    show_default=True
+    type=click.FLOAT, nargs=2, default=None,
+    help='the horizontal axis limits  [default: 0 50, or the extent of the input file]'
 )
 @click.option(
     '-y', '--y-axis', 'y_axis',
-    type=click.Tuple([float, float]), default=[0, 50],
-    help='the vertical axis limits',
-    show_default=True
+    type=click.FLOAT, nargs=2, default=None,
+    help='the vertical axis limits  [default: 0 50, or the extent of the input file]'
 )
 @click.option(
     '-s', '--random-seed', 'random_seed',
@@ -42,7 +41,7 @@ from pytsp.util import load
 @click.option(
     '-i', '--input-file', 'input_file',
     type=click.STRING, default=None,
-    help='the path to a file, containing a vertical list of points'
+    help='the path to a file, containing a vertical list of points, a binary array of points or a TSPLIB instance'
 )
 @click.option(
     '-o', '--output-file', 'output_file',
@@ -60,6 +59,27 @@ from pytsp.util import load
     is_flag=True, default=False, show_default=True,
     help='show a plain graph'
 )
+@click.option(
+    '-M', '--matrix',
+    is_flag=True, default=False, show_default=True,
+    help='precompute a dense distance matrix'
+)
+@click.option(
+    '--stride',
+    type=click.IntRange(1), default=1,
+    help='the number of iterations between logged progress events',
+    show_default=True
+)
+@click.option(
+    '-P', '--profile',
+    is_flag=True, default=False, show_default=True,
+    help='report the number of calls and the time spent in each trait'
+)
+@click.option(
+    '-T', '--time-limit', 'time_limit',
+    type=Interval(0, min_open=True), default=None,
+    help='the number of seconds after which each algorithm returns its best solution so far'
+)
 @click.pass_context
 def cli(
     ctx,
@@ -68,13 +88,19 @@ def cli(
     random_seed,
     input_file, output_file,
     logging_lvl,
-    graph
+    graph, matrix, stride, profile, time_limit
 ):
     """
     Visualization of various `Travelling Salesman` algorithms
     """
 
     if input_file is None:
+        if not x_axis:
+            x_axis = (0, 50)
+
+        if not y_axis:
+            y_axis = (0, 50)
+
         if random_seed is not None:
             seed(random_seed)
 
@@ -83,9 +109,29 @@ def cli(
             for i in range(number - 1)
         ]
     else:
-        loader = load.List(input_file)
+        loader = load.dispatch(input_file)
         cities = loader()
 
+        if metric is None:
+            metric = getattr(loader, 'metric', None)
+
+        if not isinstance(cities[0], tuple):
+            raise click.UsageError(
+                f'`{input_file}` has no coordinates to plot; '
+                'provide a `DISPLAY_DATA_SECTION`'
+            )
+
+        xs, ys = zip(*cities)
+
+        if not x_axis:
+            x_axis = (min(xs), max(xs))
+
+        if not y_axis:
+            y_axis = (min(ys), max(ys))
+
+    if metric is None:
+        metric = 'euclidean'
+
     depot, cities = cities[0], cities[1:]
 
     ctx.obj = {
@@ -95,7 +141,11 @@ def cli(
         'x_axis': x_axis,
         'y_axis': y_axis,
         'output_file': output_file,
-        'graph': graph
+        'graph': graph,
+        'matrix': matrix,
+        'stride': stride,
+        'profile': profile,
+        'time_limit': time_limit
     }
 
     logging.basicConfig(
@@ -133,21 +183,18 @@ def tsptw(ctx, service_time, time_window, *args, **kwargs):
     Various algorithms targeting the `Travelling Salesman with Time Windows` Problem
     """
 
-    def service(self, city):
-        return uniform(service_time[0], service_time[1])
-
-    def timewindow(self, city):
-        return timewindow.cache[round(city[0], 1), round(city[1], 1)]
-
     depot = ctx.obj['depot']
 
-    timewindow.cache = {}
-    timewindow.cache[round(depot[0], 1), round(depot[1], 1)] = (0, 0)
+    service, timewindow = Lookup(), Lookup()
+    for city in [depot] + ctx.obj['cities']:
+        service[city] = uniform(service_time[0], service_time[1])
+
+    timewindow[depot] = (0, 0)
     for city in ctx.obj['cities']:
         beg = uniform(time_window[0], time_window[1])
         end = uniform(beg + service_time[0], time_window[1])
 
-        timewindow.cache[round(city[0], 1), round(city[1], 1)] = (beg, end)
+        timewindow[city] = (beg, end)
 
     ctx.obj['class'] = TravellingSalesmanTimeWindows
     ctx.obj['service'] = service
@@ -178,12 +225,69 @@ for group in [tsp, tsptw]:
 
 for group in [tsp, tsptw]:
     @group.command()
+    @click.option(
+        '-k', '--neighbors',
+        type=click.IntRange(1), default=10,
+        help='the number of nearest neighbors considered for each city',
+        show_default=True
+    )
+    @click.option(
+        '-f', '--first-improvement', 'first_improvement',
+        is_flag=True, default=False, show_default=True,
+        help='restart an exhaustive scan after every improvement instead'
+    )
     @click.pass_context
     @safe
     @plot
     def opt_2(*args, **kwargs):
         pass
 
+for group in [tsp, tsptw]:
+    @group.command()
+    @click.option(
+        '-k', '--neighbors',
+        type=click.IntRange(1), default=10,
+        help='the number of nearest neighbors considered for each city',
+        show_default=True
+    )
+    @click.option(
+        '-l', '--segment-length', 'segment_length',
+        type=click.IntRange(1), default=3,
+        help='the maximum number of consecutive cities to be relocated',
+        show_default=True
+    )
+    @click.pass_context
+    @safe
+    @plot
+    def or_opt(*args, **kwargs):
+        pass
+
+for group in [tsp, tsptw]:
+    @group.command()
+    @click.option(
+        '-k', '--neighbors',
+        type=click.IntRange(1), default=10,
+        help='the number of nearest neighbors considered for each city',
+        show_default=True
+    )
+    @click.option(
+        '-d', '--depth',
+        type=click.IntRange(1), default=50,
+        help='the maximum number of exchanges in a single improving move',
+        show_default=True
+    )
+    @click.option(
+        '-b', '--breadth',
+        type=click.IntRange(1), default=5,
+        help='the number of alternatives tried for the first exchange',
+        show_default=True
+    )
+    @click.pass_context
+    @safe
+    @plot
+    def lin_kernighan(*args, **kwargs):
+        pass
+
 
 for group in [tsp, tsptw]:
     @group.command()
@@ -211,6 +315,53 @@ for group in [tsp, tsptw]:
         help='the maximum number of iterations',
         show_default=True
     )
+    @click.option(
+        '-r', '--replicas',
+        type=click.IntRange(1), default=1,
+        help='the number of replicas exchanging states across a temperature ladder',
+        show_default=True
+    )
+    @click.option(
+        '--min-temperature', 'min_temperature',
+        type=Interval(0, min_open=True), default=1,
+        help='the temperature of the coldest replica',
+        show_default=True
+    )
+    @click.option(
+        '--exchange-interval', 'exchange_interval',
+        type=click.IntRange(1), default=100,
+        help='the number of iterations between replica exchanges',
+        show_default=True
+    )
+    @click.option(
+        '-s', '--schedule',
+        type=Method(TravellingSalesman.Traits.Schedule), default=None,
+        help='the cooling schedule, applied once per temperature step'
+    )
+    @click.option(
+        '--iterations-per-temperature', 'iterations_per_temperature',
+        type=click.IntRange(1), default=100,
+        help='the number of iterations spent at each temperature',
+        show_default=True
+    )
+    @click.option(
+        '--target-acceptance', 'target_acceptance',
+        type=Interval(0, 1, min_open=True), default=0.3,
+        help='the acceptance ratio pursued by the adaptive schedule',
+        show_default=True
+    )
+    @click.option(
+        '--stagnation',
+        type=click.IntRange(1), default=20,
+        help='the number of temperatures without improvement before reheating',
+        show_default=True
+    )
+    @click.option(
+        '--reheat-factor', 'reheat_factor',
+        type=Interval(1, min_open=True), default=2,
+        help='the factor by which a frozen temperature is reheated',
+        show_default=True
+    )
     @click.pass_context
     @safe
     @plot
@@ -285,6 +436,28 @@ for group in [tsptw]:
         help='the number of trial neighbor pairs',
         show_default=True
     )
+    @click.option(
+        '--calibration-tolerance', 'calibration_tolerance',
+        type=Interval(0, min_open=True), default=0.1,
+        help='the relative precision of the calibrated maximum temperature',
+        show_default=True
+    )
+    @click.option(
+        '--checkpoint',
+        type=click.Path(dir_okay=False), default=None,
+        help='the file to periodically save the state of the run to'
+    )
+    @click.option(
+        '--checkpoint-interval', 'checkpoint_interval',
+        type=click.IntRange(1), default=10,
+        help='the number of temperature changes between checkpoints',
+        show_default=True
+    )
+    @click.option(
+        '--resume',
+        is_flag=True, default=False, show_default=True,
+        help='resume from the checkpoint file, if it exists'
+    )
     @click.pass_context
     @safe
     @plot
@@ -318,6 +491,11 @@ for group in [tsp, tsptw]:
         help='the heuristic to be used in the calculation of the fitness',
         show_default=True
     )
+    @click.option(
+        '--mst-neighbors', 'mst_neighbors',
+        type=click.IntRange(1), default=None,
+        help='restrict the minimum spanning tree to each city\'s nearest neighbors'
+    )
     @click.option(
         '-f', '--fitness',
         type=Method(TravellingSalesman.Traits.Fitness), default='weighted_mst',
@@ -348,6 +526,46 @@ for group in [tsp, tsptw]:
         help='the size of the population',
         show_default=True
     )
+    @click.option(
+        '--islands',
+        type=click.IntRange(1), default=1,
+        help='the number of populations evolving in separate processes',
+        show_default=True
+    )
+    @click.option(
+        '--migration-interval', 'migration_interval',
+        type=click.IntRange(1), default=50,
+        help='the number of generations between migrations',
+        show_default=True
+    )
+    @click.option(
+        '--migration-size', 'migration_size',
+        type=click.IntRange(1), default=2,
+        help='the number of elites migrating to each island',
+        show_default=True
+    )
+    @click.option(
+        '--topology',
+        type=click.Choice(['ring', 'complete']), default='ring',
+        help='the islands each island receives migrants from',
+        show_default=True
+    )
+    @click.option(
+        '--checkpoint',
+        type=click.Path(dir_okay=False), default=None,
+        help='the file to periodically save the state of the run to'
+    )
+    @click.option(
+        '--checkpoint-interval', 'checkpoint_interval',
+        type=click.IntRange(1), default=10,
+        help='the number of generations, or migrations with islands, between checkpoints',
+        show_default=True
+    )
+    @click.option(
+        '--resume',
+        is_flag=True, default=False, show_default=True,
+        help='resume from the checkpoint file, if it exists'
+    )
     @click.pass_context
     @safe
     @plot
@@ -355,5 +573,112 @@ for group in [tsp, tsptw]:
         pass
 
 
+@cli.group()
+def bench():
+    """
+    Benchmarking of the `Travelling Salesman` algorithms
+    """
+
+
+@bench.command()
+@click.option(
+    '-a', '--algorithm', 'algorithms',
+    type=click.Choice(list(benchmark.ALGORITHMS)), multiple=True,
+    help='the algorithms to be benchmarked (all by default)'
+)
+@click.option(
+    '-n', '--size', 'sizes',
+    type=click.IntRange(3), multiple=True, default=benchmark.SIZES,
+    help='the instance sizes to be benchmarked',
+    show_default=True
+)
+@click.option(
+    '-s', '--random-seed', 'random_seed',
+    type=click.INT, default=0,
+    help='the seed of the synthetic instances and the algorithms',
+    show_default=True
+)
+@click.option(
+    '--no-memory', 'memory',
+    is_flag=True, default=True, flag_value=False,
+    help='skip the separate run measuring the peak memory usage'
+)
+@click.option(
+    '-o', '--output-file', 'output_file',
+    type=click.STRING, default=None,
+    help='where to save the results in JSON format'
+)
+@click.pass_context
+def run(ctx, algorithms, sizes, random_seed, memory, output_file):
+    """
+    Measure the speed and quality of each algorithm
+    """
+
+    results = benchmark.run(
+        algorithms=list(algorithms) or None,
+        sizes=sizes,
+        metric=ctx.obj['metric'],
+        matrix=ctx.obj['matrix'],
+        random_seed=random_seed,
+        memory=memory
+    )
+
+    click.echo(
+        f'{"Instance":<14}{"Algorithm":<22}{"Time (s)":>10}'
+        f'{"Evaluations/s":>16}{"Peak (KiB)":>12}{"Gap":>9}'
+    )
+    for result in results['results']:
+        rate, peak = result['evaluations_per_second'], result['peak_memory']
+
+        click.echo(
+            f'{result["instance"]:<14}{result["algorithm"]:<22}'
+            f'{result["time"]:>10.3f}'
+            f'{"-" if rate is None else f"{rate:.0f}":>16}'
+            f'{"-" if peak is None else f"{peak / 1024:.0f}":>12}'
+            f'{result["gap"]:>9.2%}'
+        )
+
+    if output_file is not None:
+        benchmark.dump(results, output_file)
+
+
+@bench.command()
+@click.argument('baseline', type=click.Path(exists=True, dir_okay=False))
+@click.argument('candidate', type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    '-t', '--tolerance',
+    type=click.FloatRange(0), default=0.1,
+    help='the relative increase in time or memory considered a regression',
+    show_default=True
+)
+@click.option(
+    '-g', '--gap-tolerance', 'gap_tolerance',
+    type=click.FloatRange(0), default=0.01,
+    help='the absolute increase in the gap considered a regression',
+    show_default=True
+)
+def compare(baseline, candidate, tolerance, gap_tolerance):
+    """
+    Flag regressions between two benchmark result files
+    """
+
+    regressions = benchmark.compare(
+        benchmark.read(baseline), benchmark.read(candidate),
+        tolerance, gap_tolerance
+    )
+
+    for regression in regressions:
+        click.echo(
+            f'{regression["instance"]:<14}{regression["algorithm"]:<22}'
+            f'{regression["field"]:<12}'
+            f'{regression["baseline"]:>14.4g} -> {regression["candidate"]:<14.4g}'
+        )
+
+    if regressions:
+        raise SystemExit(1)
+
+    click.echo('No regressions')
+
+
 if __name__ == '__main__':
     cli()
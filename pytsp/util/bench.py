@@ -0,0 +1,332 @@
+import json
+import platform
+import tracemalloc
+from collections import namedtuple
+from pathlib import Path
+from random import Random, seed
+from time import perf_counter
+
+import numpy as np
+
+from pytsp.core import TravellingSalesman, TravellingSalesmanTimeWindows
+from pytsp.util import load
+
+DATA = Path(__file__).resolve().parent.parent / 'data'
+
+ALGORITHMS = {
+    'nearest_neighbor': {},
+    'convex_hull': {
+        'criterion': 'eccentricity'
+    },
+    'opt_2': {},
+    'or_opt': {},
+    'lin_kernighan': {},
+    'simulated_annealing': {
+        'mutate': 'reverse_random_sublist',
+        'max_temperature': 1000,
+        'max_iterations': 1000
+    },
+    'genetic_algorithm': {
+        'mutate': 'reverse_random_sublist',
+        'crossover': 'cut_and_stitch',
+        'select': 'random_top_half',
+        'fitness': 'inverse_cost',
+        'fitness_threshold': 1,
+        'max_iterations': 100
+    },
+    'compressed_annealing': {
+        'mutate': 'shift_1',
+        'iterations_per_temperature': 50,
+        'minimum_temperature_changes': 50,
+        'idle_temperature_changes': 25,
+        'trial_iterations': 1000,
+        'trial_neighbor_pairs': 500
+    }
+}
+
+# These algorithms are measured on a time windows variant of every instance
+TIME_WINDOWS = ('compressed_annealing',)
+
+# The slack of each time window around the reference schedule, in multiples
+# of the average distance between consecutive cities of the reference tour
+SLACK = 10
+
+SIZES = (16, 64, 256)
+
+Instance = namedtuple('Instance', ['name', 'points', 'tour', 'metric'])
+
+
+class Counter(object):
+    def __init__(self, function):
+        super().__init__()
+
+        self.function, self.count = function, 0
+
+        implementation = getattr(function, 'vectorized', None)
+        if implementation is not None:
+            self.vectorized = self.batched(implementation)
+
+    def batched(self, implementation):
+        def wrapper(model, *args):
+            result = implementation(model, *args)
+
+            self.count += np.size(result)
+
+            return result
+
+        return wrapper
+
+    def __getattr__(self, name):
+        if name == 'function':
+            raise AttributeError(name)
+
+        return getattr(self.function, name)
+
+    def __call__(self, model, *args):
+        self.count += 1
+
+        return self.function(model, *args)
+
+
+class Table(object):
+    def __init__(self, values):
+        super().__init__()
+
+        self.values = values
+
+    def __call__(self, model, city):
+        return self.values[city]
+
+
+def windows(instance, metric, random_seed):
+    points = instance.points
+
+    tsp = TravellingSalesman(metric=metric)
+
+    if instance.tour is not None:
+        i = instance.tour.index(0)
+
+        route = [points[j] for j in instance.tour[i:] + instance.tour[:i]]
+        route.append(route[0])
+    else:
+        route, _ = tsp.nearest_neighbor(points[0], points[1:])
+
+    legs = [tsp.distance(a, b) for a, b in zip(route[:-1], route[1:])]
+
+    unit = sum(legs) / len(legs)
+
+    generator = Random(f'{random_seed}:{instance.name}:windows')
+
+    service = {point: generator.uniform(0, unit) for point in points[1:]}
+    service[points[0]] = 0
+
+    # Every window contains the service of its city along the reference
+    # route, which is therefore feasible and bounds the optimal cost
+    timewindow, arrival = {points[0]: (0, float('inf'))}, 0
+    for a, b, leg in zip(route[:-2], route[1:-1], legs):
+        arrival += service[a] + leg
+
+        timewindow[b] = (
+            max(0, arrival - generator.uniform(0, SLACK * unit)),
+            arrival + service[b] + generator.uniform(0, SLACK * unit)
+        )
+
+    return Table(service), Table(timewindow), route
+
+
+def instances(sizes=SIZES, random_seed=0):
+    for path in sorted(DATA.glob('*.tsp')):
+        loader = load.TSPLIB(path)
+
+        points = loader()
+        if len(points) not in sizes:
+            continue
+
+        tour = path.with_suffix('.opt.tour')
+        tour = load.Tour(tour)() if tour.is_file() else None
+
+        yield Instance(path.stem, points, tour, loader.metric)
+
+    for size in sizes:
+        generator = Random(f'{random_seed}:{size}')
+
+        points = list(dict.fromkeys(
+            (generator.uniform(0, 1000), generator.uniform(0, 1000))
+            for _ in range(size)
+        ))
+
+        yield Instance(f'uniform{size}', points, None, None)
+
+
+def name(metric):
+    return metric if isinstance(metric, str) else metric.__class__.__name__.lower()
+
+
+def measure(instance, algorithm, kwargs, metric, matrix, random_seed, memory,
+            cls=TravellingSalesman):
+    counter = Counter(
+        getattr(TravellingSalesman.Traits.Metric, metric)
+        if isinstance(metric, str) else metric
+    )
+
+    tsp = cls(metric=counter, matrix=matrix, **kwargs)
+
+    depot, cities = instance.points[0], instance.points[1:]
+
+    seed(random_seed)
+
+    start = perf_counter()
+    route, cost = getattr(tsp, algorithm)(depot, cities)
+    elapsed = perf_counter() - start
+
+    penalty = None
+    if cls is TravellingSalesmanTimeWindows:
+        penalty = cls(metric=metric, **kwargs).penalty(route)
+
+    peak = None
+    if memory:
+        tsp = cls(metric=metric, matrix=matrix, **kwargs)
+
+        seed(random_seed)
+
+        tracemalloc.start()
+        try:
+            getattr(tsp, algorithm)(depot, cities)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    # With a matrix, the metric is only evaluated while building it, and the
+    # lookups that follow are not counted
+    evaluations = None if matrix else counter.count
+
+    return {
+        'instance': instance.name,
+        'size': len(instance.points),
+        'algorithm': algorithm,
+        'metric': name(metric),
+        'matrix': matrix,
+        'time': elapsed,
+        'evaluations': evaluations,
+        'evaluations_per_second': evaluations / elapsed
+        if evaluations is not None and elapsed > 0 else None,
+        'peak_memory': peak,
+        'cost': cost,
+        'penalty': penalty
+    }
+
+
+def run(algorithms=None, sizes=SIZES, metric='euclidean', matrix=False, random_seed=0, memory=True):
+    algorithms = list(ALGORITHMS) if algorithms is None else algorithms
+
+    results = []
+    for instance in instances(sizes, random_seed):
+        # The tours of the bundled instances are optimal under their own metric
+        instance_metric = metric if instance.metric is None else instance.metric
+
+        known = None
+        if instance.tour is not None:
+            tour = [instance.points[i] for i in instance.tour]
+            known = TravellingSalesman(metric=instance_metric).cost(tour + tour[:1])
+
+        measurements = [
+            measure(
+                instance, algorithm, ALGORITHMS.get(algorithm, {}),
+                instance_metric, matrix, random_seed, memory
+            )
+            for algorithm in algorithms if algorithm not in TIME_WINDOWS
+        ]
+
+        if measurements and known is None:
+            known = min(measurement['cost'] for measurement in measurements)
+
+        for measurement in measurements:
+            measurement['best_known'] = known
+            measurement['gap'] = measurement['cost'] / known - 1 if known > 0 else 0.0
+
+        results.extend(measurements)
+
+        timed = [algorithm for algorithm in algorithms if algorithm in TIME_WINDOWS]
+        if not timed:
+            continue
+
+        service, timewindow, route = windows(instance, instance_metric, random_seed)
+
+        known = TravellingSalesmanTimeWindows(
+            metric=instance_metric, service=service, timewindow=timewindow
+        ).cost(route)
+
+        for algorithm in timed:
+            measurement = measure(
+                instance, algorithm, {
+                    **ALGORITHMS.get(algorithm, {}),
+                    'service': service,
+                    'timewindow': timewindow
+                },
+                instance_metric, matrix, random_seed, memory,
+                TravellingSalesmanTimeWindows
+            )
+
+            measurement['best_known'] = known
+            measurement['gap'] = measurement['cost'] / known - 1 if known > 0 else 0.0
+
+            results.append(measurement)
+
+    return {
+        'environment': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'seed': random_seed
+        },
+        'results': results
+    }
+
+
+def key(result):
+    return result['instance'], result['algorithm'], result['metric'], result['matrix']
+
+
+def compare(baseline, candidate, tolerance=0.1, gap_tolerance=0.01, resolution=1e-3):
+    baseline = {key(result): result for result in baseline['results']}
+
+    regressions = []
+    for result in candidate['results']:
+        reference = baseline.get(key(result))
+        if reference is None:
+            continue
+
+        checks = [
+            ('time', max(
+                reference['time'] * (1 + tolerance),
+                reference['time'] + resolution
+            )),
+            ('gap', reference['gap'] + gap_tolerance)
+        ]
+
+        if reference['peak_memory'] is not None and result['peak_memory'] is not None:
+            checks.append(
+                ('peak_memory', reference['peak_memory'] * (1 + tolerance))
+            )
+
+        for field, limit in checks:
+            if result[field] > limit:
+                regressions.append({
+                    'instance': result['instance'],
+                    'algorithm': result['algorithm'],
+                    'field': field,
+                    'baseline': reference[field],
+                    'candidate': result[field]
+                })
+
+    return regressions
+
+
+def dump(results, filename):
+    with open(filename, 'w') as stream:
+        json.dump(results, stream, indent=4)
+
+
+def read(filename):
+    with open(filename) as stream:
+        return json.load(stream)
@@ -1,8 +1,11 @@
 
 from abc import ABC, abstractmethod, abstractstaticmethod
 from csv import reader
+from itertools import islice
 from pathlib import Path
-from re import match
+from re import MULTILINE, compile, match
+
+import numpy as np
 
 
 class Loader(ABC):
@@ -22,19 +25,265 @@ class Loader(ABC):
     def __call__(self):
         pass
 
+
+def unique(points):
+    keys = np.ascontiguousarray(points, dtype=np.float64).view(np.complex128).ravel()
+
+    _, index = np.unique(keys, return_index=True)
+
+    return points[np.sort(index)]
+
+
 class List(Loader):
+    CHUNK_SIZE = 2 ** 16
+
+    ENTRY = compile(r'^\(([\+\-0-9\.]+)\s*,\s*([\+\-0-9\.]+)\)$', MULTILINE)
+
     @staticmethod
     def extension():
         return r'txt'
 
+    def array(self):
+        points, n = np.empty((self.CHUNK_SIZE, 2)), 0
+
+        with self.file.open() as stream:
+            for chunk in iter(lambda: list(islice(stream, self.CHUNK_SIZE)), []):
+                entries = self.ENTRY.findall(''.join(chunk))
+
+                try:
+                    assert len(entries) == len(chunk)
+
+                    entries = np.array(entries, dtype=float)
+                except (AssertionError, ValueError):
+                    for line, entry in enumerate(chunk):
+                        fields = self.ENTRY.match(entry)
+
+                        try:
+                            assert fields is not None
+
+                            tuple(map(float, fields.groups()))
+                        except (AssertionError, ValueError):
+                            raise ValueError(f'{self.file}:{n + line + 1:02d}: Failed to evaluate entry `{entry}`')
+
+                if n + len(entries) > len(points):
+                    points = np.resize(points, (2 * len(points), 2))
+
+                points[n:n + len(entries)] = entries
+                n += len(entries)
+
+        return points[:n]
+
+    def __call__(self):
+        return list(map(tuple, unique(self.array()).tolist()))
+
+
+class Binary(Loader):
+    @staticmethod
+    def extension():
+        return r'npy|f64'
+
+    @staticmethod
+    def dump(points, filename):
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+
+        if Path(filename).suffix == '.npy':
+            np.save(filename, points)
+        else:
+            points.tofile(filename)
+
+    def array(self):
+        if self.file.suffix == '.npy':
+            points = np.load(self.file, mmap_mode='r')
+        else:
+            points = np.memmap(self.file, dtype=np.float64, mode='r')
+
+        return points.reshape(-1, 2)
+
+    def __call__(self):
+        return list(map(tuple, unique(self.array()).tolist()))
+
+
+class Explicit(object):
+    def __init__(self, distances, points=None):
+        super().__init__()
+
+        self.distances = distances
+        self.symmetric = bool(np.array_equal(distances, distances.T))
+
+        if points is None:
+            self.index = None
+            self.vectorized = self.lookup
+        else:
+            self.index = {point: i for i, point in enumerate(points)}
+
+    def lookup(self, model, p1, p2):
+        return self.distances[p1.astype(np.intp), p2.astype(np.intp)]
+
+    def __call__(self, model, p1, p2):
+        if self.index is not None:
+            p1, p2 = self.index[p1], self.index[p2]
+
+        return self.distances.item(p1, p2)
+
+
+class TSPLIB(Loader):
+    METRICS = {
+        'EUC_2D': 'euc_2d',
+        'CEIL_2D': 'ceil_2d',
+        'ATT': 'att',
+        'GEO': 'geo'
+    }
+
+    @staticmethod
+    def extension():
+        return r'tsp'
+
     def __call__(self):
-        entries = []
+        self.specification = {}
+        self.coordinates, self.distances, self.display = None, None, None
 
         with self.file.open() as stream:
-            for line, entry in enumerate(stream.readlines()):
-                if match(r'^\([\+\-0-9\.]+\s*,\s*[\+\-0-9\.]+\)$', entry):
-                    entries.append(eval(entry))
+            while True:
+                line = stream.readline()
+                if line == '':
+                    break
+
+                entry = line.strip()
+                if entry in ('', 'EOF'):
+                    continue
+
+                if entry.startswith('NODE_COORD_SECTION'):
+                    self.coordinates = self.nodes(stream)
+                elif entry.startswith('DISPLAY_DATA_SECTION'):
+                    self.display = self.nodes(stream)
+                elif entry.startswith('EDGE_WEIGHT_SECTION'):
+                    self.distances = self.weights(stream)
+                elif entry.endswith('_SECTION'):
+                    raise ValueError(f'{self.file}: Unsupported section `{entry}`')
                 else:
-                    raise ValueError(f'{self.file}:{line + 1:02d}: Failed to evaluate entry `{entry}`')
+                    key, _, value = entry.partition(':')
+                    self.specification[key.strip()] = value.strip()
+
+        kind = self.specification.get('EDGE_WEIGHT_TYPE')
+
+        if kind == 'EXPLICIT':
+            if self.distances is None:
+                raise ValueError(f'{self.file}: Missing `EDGE_WEIGHT_SECTION`')
+
+            if self.display is None:
+                points = list(range(self.dimension))
+            else:
+                points = list(map(tuple, self.display.tolist()))
+
+            self.metric = Explicit(
+                self.distances, None if self.display is None else points
+            )
+
+            return points
+
+        if kind not in self.METRICS:
+            raise ValueError(f'{self.file}: Unsupported edge weight type `{kind}`')
+
+        if self.coordinates is None:
+            raise ValueError(f'{self.file}: Missing `NODE_COORD_SECTION`')
+
+        self.metric = self.METRICS[kind]
+
+        return list(map(tuple, self.coordinates.tolist()))
+
+    @property
+    def name(self):
+        return self.specification.get('NAME', self.file.stem)
+
+    @property
+    def dimension(self):
+        try:
+            return int(self.specification['DIMENSION'])
+        except (KeyError, ValueError):
+            raise ValueError(f'{self.file}: Missing or invalid `DIMENSION`')
+
+    def numbers(self, stream, count):
+        values, i = np.empty(count), 0
+        while i < count:
+            line = stream.readline()
+            if line == '':
+                raise ValueError(f'{self.file}: Unexpected end of file')
+
+            row = np.array(line.split(), dtype=float)
+            if i + len(row) > count:
+                raise ValueError(f'{self.file}: Unexpected entry `{line.strip()}`')
+
+            values[i:i + len(row)] = row
+            i += len(row)
+
+        return values
+
+    def nodes(self, stream):
+        n = self.dimension
+
+        nodes = self.numbers(stream, 3 * n).reshape(n, 3)
+
+        coordinates = np.empty((n, 2))
+        coordinates[nodes[:, 0].astype(np.intp) - 1] = nodes[:, 1:]
+
+        return coordinates
+
+    def weights(self, stream):
+        n, layout = self.dimension, self.specification.get('EDGE_WEIGHT_FORMAT')
+
+        if layout == 'FULL_MATRIX':
+            return self.numbers(stream, n * n).reshape(n, n)
+
+        triangles = {
+            'UPPER_ROW': (np.triu_indices, 1),
+            'LOWER_ROW': (np.tril_indices, -1),
+            'UPPER_DIAG_ROW': (np.triu_indices, 0),
+            'LOWER_DIAG_ROW': (np.tril_indices, 0)
+        }
+
+        if layout not in triangles:
+            raise ValueError(f'{self.file}: Unsupported edge weight format `{layout}`')
+
+        indices, k = triangles[layout]
+        rows, columns = indices(n, k)
+
+        distances = np.zeros((n, n))
+        distances[rows, columns] = self.numbers(stream, len(rows))
+        distances[columns, rows] = distances[rows, columns]
+
+        return distances
+
+
+class Tour(Loader):
+    @staticmethod
+    def extension():
+        return r'tour'
+
+    def __call__(self):
+        entries, section = [], False
+
+        with self.file.open() as stream:
+            for line, entry in enumerate(stream.readlines()):
+                entry = entry.strip()
+
+                if entry == 'TOUR_SECTION':
+                    section = True
+                elif section and entry not in ('', 'EOF', '-1'):
+                    try:
+                        entries.append(int(entry) - 1)
+                    except ValueError:
+                        raise ValueError(f'{self.file}:{line + 1:02d}: Failed to evaluate entry `{entry}`')
+                elif entry == '-1':
+                    section = False
+
+        return entries
+
+
+def dispatch(filename):
+    suffix = Path(filename).suffix[1:]
+
+    for loader in (List, Binary, TSPLIB, Tour):
+        if match(loader.extension(), suffix):
+            return loader(filename)
 
-        return list(dict.fromkeys(entries))
+    raise ValueError(f'Unexpected extension `.{suffix}`')
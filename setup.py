@@ -18,6 +18,7 @@ setup(
 
     packages=find_packages(),
     include_package_data=True,
+    package_data={'pytsp': ['data/*']},
 
     install_requires=requirements,
 